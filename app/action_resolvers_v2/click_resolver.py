@@ -16,7 +16,8 @@ class _NavLink:
         self.text = text
         self.bbox = bbox
     def score(self, query: str) -> float:
-        return ElementRankerV2().rank(query, [self], top_n=1)[0][0] if ElementRankerV2().rank(query, [self], top_n=1) else 0.0
+        ranked = ElementRankerV2().rank(query, [self], top_n=1)
+        return ranked[0][0] if ranked else 0.0
 
 
 async def _nav_links(page: Page) -> list:
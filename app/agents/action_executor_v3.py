@@ -45,7 +45,8 @@ class ActionExecutorV3:
     async def navigate(self, page: Page, url: str) -> ActionResult:
         """Navigate to URL."""
         logger.info("[EXECUTOR_V3] NAVIGATE: %s", url[:80] if url else "")
-        before = await self.validator.capture_state(page)
+        # validate_navigation only compares URLs, so skip the DOM fingerprint
+        before = await self.validator.capture_state(page, level="light")
         try:
             await page.goto(url or "", wait_until="domcontentloaded")
             await page.wait_for_timeout(500)
@@ -54,7 +55,7 @@ class ActionExecutorV3:
             if hasattr(self.resolver.locator, 'dom') and hasattr(self.resolver.locator.dom, 'clear_cache'):
                 self.resolver.locator.dom.clear_cache()
             
-            after = await self.validator.capture_state(page)
+            after = await self.validator.capture_state(page, level="light")
             if self.validator.validate_navigation(before, after):
                 return ActionResult(success=True, before_state=before, after_state=after)
             return ActionResult(success=True, before_state=before, after_state=after)  # lenient
@@ -8,9 +8,9 @@ from typing import List, Dict, Any, Optional
 import json
 import logging
 import hashlib
-from difflib import SequenceMatcher
 
 from app.config import settings
+from app.core.element_ranker import text_similarity
 from app.flow_optimization.fragment_store import FragmentStore
 
 logger = logging.getLogger(__name__)
@@ -76,7 +76,7 @@ class PlannerAgent:
     
     def _similarity_ratio(self, a: str, b: str) -> float:
         """Calculate similarity between two strings."""
-        return SequenceMatcher(None, a.lower().strip(), b.lower().strip()).ratio()
+        return text_similarity(a.strip(), b.strip())
     
     async def _check_fragment_cache(self, instruction_text: str) -> Optional[List[ExecutionStep]]:
         """
@@ -84,15 +84,12 @@ class PlannerAgent:
         Returns cached steps if found, None otherwise.
         """
         try:
-            rows = self.fragment_store.fetch_all()
+            rows = self.fragment_store.fetch_parsed()
             
             best_match_score = 0.0
             best_match_steps = None
             
-            for row in rows:
-                fragment_id, site, start_url, end_url, steps_json, success_count = row
-                steps = json.loads(steps_json)
-                
+            for site, start_url, end_url, steps in rows:
                 # Reconstruct instruction from steps
                 fragment_instruction = self._steps_to_instruction(steps)
                 similarity = self._similarity_ratio(instruction_text, fragment_instruction)
@@ -12,11 +12,12 @@ from .element_filter import ElementFilter
 from .element_ranker import ElementRanker
 from .outcome_validator import OutcomeValidator, PageState
 from .dom_model import DOMElement
+from .element_batch import ElementBatch
 from .product_extractor import resolve_product
 from .input_resolver import resolve_input
 from .search_handler import handle_search
 from .flow_handlers import select_delivery, click_all_checkboxes
-from .region_model import detect_regions, get_region_for_context
+from .region_model import get_region_for_context, region_masks
 
 logger = logging.getLogger(__name__)
 
@@ -112,38 +113,34 @@ class ActionExecutor:
         """Extract (DOMElement, Locator) pairs, filter, rank, then click the locator directly (no get_by_text)."""
         before = before_state or await self.validator.capture_state(page)
         pairs = await self.extractor.extract_clickables(page)
-        elements = [e for e, _ in pairs]
-        logger.info("[EXECUTOR] Extracted %d clickable elements", len(elements))
-        filtered_elements = self.filter.apply_standard_filters(elements, "CLICK")
-        filtered_pairs = [(e, loc) for e, loc in pairs if e in filtered_elements]
+        # Columnar batch is the carrier through filter -> region -> ranker; locators are
+        # looked up once per ranked candidate at the end
+        batch = ElementBatch.from_elements([e for e, _ in pairs])
+        locator_by_id = {id(e): loc for e, loc in pairs}
+        logger.info("[EXECUTOR] Extracted %d clickable elements", len(batch))
+        candidates = self.filter.apply_standard_filters(batch, "CLICK")
         # Fallback: if no elements passed (e.g. footer links, short labels), relax empty-text filter
-        if not filtered_pairs and elements:
-            visible = self.filter.filter_by_visibility(elements)
+        if not len(candidates) and len(batch):
+            visible = self.filter.filter_by_visibility(batch)
             clickable = self.filter.filter_by_action_type(visible, "CLICK")
-            relaxed = self.filter.filter_by_size(clickable)
-            filtered_pairs = [(e, loc) for e, loc in pairs if e in relaxed]
-            if filtered_pairs:
-                logger.info("[EXECUTOR] Using relaxed filter: %d elements", len(filtered_pairs))
-        if region_context and filtered_pairs:
-            regions = detect_regions([e for e, _ in filtered_pairs])
+            candidates = self.filter.filter_by_size(clickable)
+            if len(candidates):
+                logger.info("[EXECUTOR] Using relaxed filter: %d elements", len(candidates))
+        if region_context and len(candidates):
             region_key = get_region_for_context(region_context)
-            region_elements = regions.get(region_key) or []
-            if region_elements:
-                region_set = {id(ee) for ee in region_elements}
-                filtered_pairs = [(e, loc) for e, loc in filtered_pairs if id(e) in region_set]
-                logger.info("[EXECUTOR] Using region '%s' (%d elements)", region_key, len(filtered_pairs))
-        if not filtered_pairs:
+            in_region = region_masks(candidates)[region_key]
+            if in_region.any():
+                candidates = candidates[in_region]
+                logger.info("[EXECUTOR] Using region '%s' (%d elements)", region_key, len(candidates))
+        if not len(candidates):
             return ActionResult(success=False, error="No clickable elements found matching filters", before_state=before)
-        filtered_elements = [e for e, _ in filtered_pairs]
         ranked_elements = self.ranker.get_top_candidates(
-            filtered_elements, target_text, top_n=self.max_retries, region_context=region_context
+            candidates, target_text, top_n=self.max_retries, region_context=region_context
         )
         if not ranked_elements:
             return ActionResult(success=False, error=f"No elements scored above threshold for '{target_text}'", before_state=before)
         for attempt, element in enumerate(ranked_elements, 1):
-            locator = next((loc for e, loc in filtered_pairs if e is element), None) or next(
-                (loc for e, loc in filtered_pairs if e.text == element.text and e.tag == element.tag), None
-            )
+            locator = locator_by_id.get(id(element))
             if not locator:
                 logger.warning("Attempt %d: no locator for element '%s'", attempt, element.display_name[:50])
                 continue
@@ -267,8 +264,8 @@ class ActionExecutor:
         if not best_element:
             return ActionResult(success=False, error=f"No input field found for '{target_field}'", before_state=before_state)
         try:
-            if best_element.attributes.get("placeholder"):
-                locator = page.get_by_placeholder(best_element.attributes["placeholder"])
+            if best_element.placeholder:
+                locator = page.get_by_placeholder(best_element.placeholder)
             elif best_element.text:
                 locator = page.get_by_label(best_element.text)
             else:
@@ -294,12 +291,13 @@ class ActionExecutor:
         """
         logger.info("[EXECUTOR] NAVIGATE action: url=%s", url[:80] if url else "")
         
-        before_state = await self.validator.capture_state(page)
+        # validate_navigation only compares URLs, so skip the DOM fingerprint
+        before_state = await self.validator.capture_state(page, level="light")
         
         try:
             await page.goto(url, wait_until="domcontentloaded")
             
-            after_state = await self.validator.capture_state(page)
+            after_state = await self.validator.capture_state(page, level="light")
             
             if self.validator.validate_navigation(before_state, after_state):
                 logger.info(f"✓ Navigation successful: {url}")
@@ -390,9 +388,10 @@ class ActionExecutor:
         """
         logger.info(f"Waiting for element: '{target_text}'")
         
-        start_time = asyncio.get_event_loop().time()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
         
-        while asyncio.get_event_loop().time() - start_time < timeout:
+        while loop.time() < deadline:
             elements = await self.extractor.extract_all_interactive(page)
             filtered = self.filter.apply_standard_filters(elements, "CLICK")
             
@@ -4,10 +4,43 @@ Handles browser lifecycle and session management.
 """
 from playwright.async_api import async_playwright, Browser, Page, Playwright
 from typing import Optional
+import inspect
 import logging
+import os
+import types
 
 logger = logging.getLogger(__name__)
 
+# UI_AUTO_FAST=true: skip the inspect.stack() walk Playwright does on every API call
+# (a large share of CPU in evaluate-heavy loops). Playwright error messages and traces
+# then lose the calling API name / source location, so it is off by default.
+UI_AUTO_FAST = os.getenv("UI_AUTO_FAST", "false").lower() in ("1", "true")
+
+
+def _skip_playwright_call_stacks() -> None:
+    """Give Playwright's connection module an inspect whose stack() is empty (rest unchanged)."""
+    try:
+        from playwright._impl import _connection
+    except ImportError:
+        logger.warning("UI_AUTO_FAST: playwright internals not found, leaving call stacks on")
+        return
+
+    class _NoStackInspect(types.ModuleType):
+        def __getattr__(self, name):
+            return getattr(inspect, name)
+
+        @staticmethod
+        def stack(*args, **kwargs):
+            return []
+
+    # Scoped to Playwright's module; the global inspect.stack stays intact for everything else
+    _connection.inspect = _NoStackInspect("inspect")
+    logger.info("UI_AUTO_FAST: Playwright call-stack capture disabled")
+
+
+if UI_AUTO_FAST:
+    _skip_playwright_call_stacks()
+
 
 class BrowserManager:
     """Manages browser lifecycle and page sessions."""
@@ -9,6 +9,8 @@ class BaseComponent(ABC):
     def __init__(self, locator: Any, text: str, bbox: Optional[Dict[str, float]] = None):
         self.locator = locator
         self.text = (text or "").strip()
+        # Lower-cased once here; score() / ElementRankerV2 compare against it for every query
+        self.text_lower = self.text.lower()
         self.bbox = bbox
 
     def score(self, query: str) -> float:
@@ -46,5 +46,5 @@ class RadioGroupComponent(BaseComponent):
         from app.core.semantic.embedding_scorer import EmbeddingScorer
         scorer = EmbeddingScorer()
         sem = scorer.score(query, self.text)
-        sub = 1.0 if (query or "").lower() in (self.text or "").lower() else 0.0
+        sub = 1.0 if (query or "").lower() in self.text_lower else 0.0
         return sem * 0.7 + sub * 0.3
@@ -3,6 +3,7 @@ DOM extraction and element discovery.
 Visible-first: only query visible elements, then cap. Scroll before extraction on listing pages.
 """
 import asyncio
+import json
 from playwright.async_api import Page, Locator
 from typing import List, Optional, Tuple
 import logging
@@ -14,6 +15,84 @@ MAX_CLICKABLES_TO_EXTRACT = 350
 MAX_INPUTS_TO_EXTRACT = 50
 PER_ELEMENT_TIMEOUT_SEC = 2.0
 
+# DOMElement.attributes key -> DOM attribute name
+_ATTRIBUTE_NAMES = (
+    ("aria_label", "aria-label"),
+    ("data_testid", "data-testid"),
+    ("id", "id"),
+    ("class", "class"),
+    ("type", "type"),
+    ("name", "name"),
+    ("placeholder", "placeholder"),
+    ("title", "title"),
+    ("href", "href"),
+)
+
+# Returns only the attributes that are present, keyed as in DOMElement.attributes
+_ATTRIBUTES_JS = """
+el => {
+    const out = {};
+    for (const [key, attr] of %s) {
+        const v = el.getAttribute(attr);
+        if (v !== null) out[key] = v;
+    }
+    return out;
+}
+""" % json.dumps([list(pair) for pair in _ATTRIBUTE_NAMES])
+
+REGION_SELECTOR = "button, a, [role='button']"
+REGION_EXTRACT_CONCURRENCY = 8
+
+# Same fields as _extract_element, for every visible match under root, in one evaluate
+_REGION_RECORDS_JS = """
+(root, args) => {
+    const [selector, attrNames] = args;
+    const out = [];
+    root.querySelectorAll(selector).forEach((el) => {
+        const r = el.getBoundingClientRect();
+        if (!(r.width > 0 && r.height > 0)) return;
+        if (window.getComputedStyle(el).visibility === 'hidden') return;
+        const attributes = {};
+        for (const [key, attr] of attrNames) {
+            const v = el.getAttribute(attr);
+            if (v !== null) attributes[key] = v;
+        }
+        const container = el.closest('div[class*="container"], section, article, nav, header, footer');
+        let css = null;
+        if (el.id && /^[a-zA-Z][a-zA-Z0-9_-]*$/.test(el.id)) css = '#' + el.id;
+        else if (el.getAttribute('data-testid')) css = '[data-testid="' + el.getAttribute('data-testid').replace(/"/g, '\\"') + '"]';
+        out.push({
+            tag: el.tagName,
+            text: el.textContent || '',
+            role: el.getAttribute('role'),
+            bbox: {x: r.x, y: r.y, width: r.width, height: r.height},
+            attributes: attributes,
+            parent_text: el.parentElement ? el.parentElement.textContent : null,
+            container: (container && container.className) || null,
+            css_selector: css,
+        });
+    });
+    return out;
+}
+"""
+
+
+def _href_selector(tag: Optional[str], attributes: dict) -> Optional[str]:
+    """Fallback selector for links without id/testid: short relative href."""
+    if tag and str(tag).lower() == "a" and attributes.get("href"):
+        href = attributes["href"]
+        if href.startswith("/") and len(href) <= 100:
+            return f'a[href="{href}"]'
+    return None
+
+
+def _element_from_record(record: dict) -> DOMElement:
+    """Build a DOMElement from one _REGION_RECORDS_JS record."""
+    element = DOMElement.from_raw(record)
+    if not element.css_selector:
+        element.css_selector = _href_selector(element.tag, element.attributes)
+    return element
+
 
 async def _scroll_for_lazy_load(page: Page) -> None:
     """Scroll to load lazy content (e.g. product grids) then back. Call before extraction on listing pages."""
@@ -213,21 +292,8 @@ class DOMExtractor:
                     height=bbox_data["height"]
                 )
             
-            # Extract attributes
-            attributes = {
-                "aria_label": await locator.get_attribute("aria-label"),
-                "data_testid": await locator.get_attribute("data-testid"),
-                "id": await locator.get_attribute("id"),
-                "class": await locator.get_attribute("class"),
-                "type": await locator.get_attribute("type"),
-                "name": await locator.get_attribute("name"),
-                "placeholder": await locator.get_attribute("placeholder"),
-                "title": await locator.get_attribute("title"),
-                "href": await locator.get_attribute("href"),
-            }
-            
-            # Remove None values
-            attributes = {k: v for k, v in attributes.items() if v is not None}
+            # Extract attributes in one round-trip (JS already drops missing ones)
+            attributes = await locator.evaluate(_ATTRIBUTES_JS) or {}
             
             # Extract parent context
             parent_text = await locator.evaluate(
@@ -242,10 +308,8 @@ class DOMExtractor:
             css_selector = await locator.evaluate(
                 "el => { if (el.id && /^[a-zA-Z][a-zA-Z0-9_-]*$/.test(el.id)) return '#' + el.id; const t = el.getAttribute('data-testid'); if (t) return '[data-testid=\"' + t.replace(/\"/g, '\\\\\"') + '\"]'; return null; }"
             )
-            if not css_selector and tag and str(tag).lower() == "a" and attributes.get("href"):
-                href = attributes["href"]
-                if href.startswith("/") and len(href) <= 100:
-                    css_selector = f'a[href="{href}"]'
+            if not css_selector:
+                css_selector = _href_selector(tag, attributes)
 
             return DOMElement(
                 tag=tag,
@@ -282,14 +346,15 @@ class DOMExtractor:
                 logger.warning(f"Region not visible: {region_selector}")
                 return elements
             
-            # Extract clickables within region
-            clickables = region.locator("button, a, [role='button']")
-            count = await clickables.count()
-            
-            for i in range(count):
-                element = await self._extract_element(clickables.nth(i))
-                if element and element.visible:
-                    elements.append(element)
+            try:
+                records = await region.evaluate(
+                    _REGION_RECORDS_JS,
+                    [REGION_SELECTOR, [list(pair) for pair in _ATTRIBUTE_NAMES]],
+                )
+                elements = [_element_from_record(r) for r in records]
+            except Exception as batch_err:
+                logger.debug("Batched region extraction failed, extracting per element: %s", batch_err)
+                elements = await self._extract_region_concurrently(region)
             
             logger.info(f"Extracted {len(elements)} elements from region")
             
@@ -298,6 +363,19 @@ class DOMExtractor:
         
         return elements
     
+    async def _extract_region_concurrently(self, region: Locator) -> List[DOMElement]:
+        """Per-element fallback for extract_by_region, bounded by REGION_EXTRACT_CONCURRENCY."""
+        clickables = region.locator(REGION_SELECTOR)
+        count = await clickables.count()
+        semaphore = asyncio.Semaphore(REGION_EXTRACT_CONCURRENCY)
+
+        async def extract(i: int) -> Optional[DOMElement]:
+            async with semaphore:
+                return await self._extract_element(clickables.nth(i))
+
+        results = await asyncio.gather(*(extract(i) for i in range(count)))
+        return [e for e in results if e and e.visible]
+
     def clear_cache(self) -> None:
         """Clear element cache."""
         self.element_cache.clear()
@@ -2,8 +2,8 @@
 DOM element model and structured representation.
 Never use raw DOM - always convert to structured objects.
 """
-from dataclasses import dataclass
-from typing import Optional, Dict, Any
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, Tuple
 from enum import Enum
 
 
@@ -19,7 +19,82 @@ class ElementType(Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+# One bit per element type, and the types each action accepts (unknown actions accept all)
+TYPE_BITS: Dict[ElementType, int] = {t: 1 << i for i, t in enumerate(ElementType)}
+ACTION_TYPE_MASKS: Dict[str, int] = {
+    "CLICK": TYPE_BITS[ElementType.BUTTON] | TYPE_BITS[ElementType.LINK],
+    "TYPE": TYPE_BITS[ElementType.INPUT] | TYPE_BITS[ElementType.TEXTAREA],
+    "SELECT": TYPE_BITS[ElementType.SELECT],
+}
+
+
+# Small-int ids for the tags and roles filters/scorers compare against (0 = other).
+# Tags are matched case-insensitively (DOM tagName is upper-case); roles exactly.
+TAG_IDS: Dict[str, int] = {
+    tag: i for i, tag in enumerate(
+        ("a", "button", "input", "select", "textarea", "label", "option", "img",
+         "div", "span", "li", "form", "section", "nav", "header", "footer", "article"),
+        start=1,
+    )
+}
+ROLE_IDS: Dict[str, int] = {
+    role: i for i, role in enumerate(
+        ("button", "link", "textbox", "searchbox", "combobox", "checkbox", "radio",
+         "menuitem", "tab", "option"),
+        start=1,
+    )
+}
+CLICKABLE_ROLE_IDS = frozenset((ROLE_IDS["button"], ROLE_IDS["link"]))
+
+
+def _classify(tag: str, role: Optional[str], input_type: Optional[str]) -> ElementType:
+    """Determine element type from tag, role and input type."""
+    tag_lower = tag.lower()
+    
+    if tag_lower == "button" or role == "button":
+        return ElementType.BUTTON
+    elif tag_lower == "a":
+        return ElementType.LINK
+    elif tag_lower == "input":
+        input_type = input_type or "text"
+        if input_type == "checkbox":
+            return ElementType.CHECKBOX
+        elif input_type == "radio":
+            return ElementType.RADIO
+        return ElementType.INPUT
+    elif tag_lower == "select":
+        return ElementType.SELECT
+    elif tag_lower == "textarea":
+        return ElementType.TEXTAREA
+    
+    return ElementType.UNKNOWN
+
+
+def _display_name(
+    tag: str,
+    text: str,
+    aria_label: Optional[str],
+    title: Optional[str],
+    placeholder: Optional[str],
+    element_id: Optional[str],
+) -> str:
+    """Best display name for element: text, then aria-label / title / placeholder."""
+    if text and text.strip():
+        return text.strip()
+    
+    if aria_label:
+        return aria_label
+    
+    if title:
+        return title
+    
+    if placeholder:
+        return placeholder
+    
+    return f"{tag}_{element_id if element_id is not None else 'unknown'}"
+
+
+@dataclass(slots=True)
 class BoundingBox:
     """Element position and dimensions."""
     x: float
@@ -43,11 +118,14 @@ class BoundingBox:
         return self.width * self.height
 
 
-@dataclass
+@dataclass(slots=True)
 class DOMElement:
     """
     Structured representation of a DOM element.
     This is the ONLY way we interact with page elements.
+    Slotted (no per-instance __dict__). The attributes read by filters and scorers
+    (aria_label, title, placeholder, input_type, element_id) are copied out of the raw
+    attributes dict once at construction; the rest are looked up on access.
     """
     tag: str
     text: str
@@ -59,80 +137,126 @@ class DOMElement:
     container: Optional[str] = None
     xpath: Optional[str] = None
     css_selector: Optional[str] = None
+
+    # Extracted once in __post_init__; extracted elements are never mutated afterwards
+    aria_label: Optional[str] = field(init=False, repr=False, compare=False)
+    title: Optional[str] = field(init=False, repr=False, compare=False)
+    placeholder: Optional[str] = field(init=False, repr=False, compare=False)
+    input_type: Optional[str] = field(init=False, repr=False, compare=False)
+    element_id: Optional[str] = field(init=False, repr=False, compare=False)
+    _tag_id: int = field(init=False, repr=False, compare=False)
+    _role_id: int = field(init=False, repr=False, compare=False)
+    _text_lower: str = field(init=False, repr=False, compare=False)
+    _container_lower: str = field(init=False, repr=False, compare=False)
+    _aria_lower: str = field(init=False, repr=False, compare=False)
+    _element_type: ElementType = field(init=False, repr=False, compare=False)
+    _type_bit: int = field(init=False, repr=False, compare=False)
+    _is_clickable: bool = field(init=False, repr=False, compare=False)
+    _is_input: bool = field(init=False, repr=False, compare=False)
+    _display_name: str = field(init=False, repr=False, compare=False)
+    _history_key: Optional[Tuple[str, str, str]] = field(default=None, init=False, repr=False, compare=False)
+    # Target-independent texts the ranker matches against, filled on first ranking
+    _match_texts: Optional[Tuple[str, str, str, str]] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        attributes = self.attributes
+        self.aria_label = attributes.get("aria_label")
+        self.title = attributes.get("title")
+        self.placeholder = attributes.get("placeholder")
+        self.input_type = attributes.get("type")
+        self.element_id = attributes.get("id")
+        self._tag_id = TAG_IDS.get(self.tag.lower(), 0)
+        self._role_id = ROLE_IDS.get(self.role, 0) if self.role else 0
+        # Lower-cased once here; filters and scorers compare against these on every call
+        self._text_lower = (self.text or "").lower()
+        self._container_lower = (self.container or "").lower()
+        self._aria_lower = (self.aria_label or "").lower()
+        self._element_type = _classify(self.tag, self.role, self.input_type)
+        self._type_bit = TYPE_BITS[self._element_type]
+        self._is_clickable = self._element_type in (ElementType.BUTTON, ElementType.LINK)
+        self._is_input = self._element_type in (ElementType.INPUT, ElementType.TEXTAREA)
+        self._display_name = _display_name(
+            self.tag, self.text, self.aria_label, self.title, self.placeholder, self.element_id
+        )
+
+    @classmethod
+    def from_raw(cls, raw: Dict[str, Any]) -> "DOMElement":
+        """
+        Build an element from a raw extraction record (the dict shape produced by the
+        extraction JS: tag, text, role, visible, bbox, attributes, parent_text, ...).
+        """
+        bbox = raw.get("bbox")
+        return cls(
+            tag=raw.get("tag") or "",
+            text=(raw.get("text") or "").strip(),
+            role=raw.get("role"),
+            visible=raw.get("visible", True),
+            bounding_box=BoundingBox(**bbox) if bbox else None,
+            attributes=raw.get("attributes") or {},
+            parent_text=raw.get("parent_text"),
+            container=raw.get("container"),
+            xpath=raw.get("xpath"),
+            css_selector=raw.get("css_selector"),
+        )
+
+    @property
+    def data_testid(self) -> Optional[str]:
+        """data-testid attribute (read on access)."""
+        return self.attributes.get("data_testid")
+
+    @property
+    def class_name(self) -> Optional[str]:
+        """class attribute (read on access)."""
+        return self.attributes.get("class")
+
+    @property
+    def name(self) -> Optional[str]:
+        """name attribute (read on access)."""
+        return self.attributes.get("name")
+
+    @property
+    def href(self) -> Optional[str]:
+        """href attribute (read on access)."""
+        return self.attributes.get("href")
+    
+    @property
+    def history_key(self) -> Tuple[str, str, str]:
+        """Key for ranker history lookups: (tag, text, id), built on first use."""
+        if self._history_key is None:
+            self._history_key = (self.tag, self.text, self.element_id or "")
+        return self._history_key
     
     @property
     def element_type(self) -> ElementType:
-        """Determine element type from tag and role."""
-        tag_lower = self.tag.lower()
-        
-        if tag_lower == "button" or self.role == "button":
-            return ElementType.BUTTON
-        elif tag_lower == "a":
-            return ElementType.LINK
-        elif tag_lower == "input":
-            input_type = self.attributes.get("type", "text")
-            if input_type == "checkbox":
-                return ElementType.CHECKBOX
-            elif input_type == "radio":
-                return ElementType.RADIO
-            return ElementType.INPUT
-        elif tag_lower == "select":
-            return ElementType.SELECT
-        elif tag_lower == "textarea":
-            return ElementType.TEXTAREA
-        
-        return ElementType.UNKNOWN
+        """Element type from tag and role (computed at construction)."""
+        return self._element_type
     
     @property
     def is_clickable(self) -> bool:
         """Check if element is clickable."""
-        return self.element_type in [
-            ElementType.BUTTON,
-            ElementType.LINK
-        ]
+        return self._is_clickable
     
     @property
     def is_input(self) -> bool:
         """Check if element accepts text input."""
-        return self.element_type in [
-            ElementType.INPUT,
-            ElementType.TEXTAREA
-        ]
+        return self._is_input
     
     @property
     def display_name(self) -> str:
         """Get best display name for element."""
-        if self.text and self.text.strip():
-            return self.text.strip()
-        
-        aria_label = self.attributes.get("aria_label")
-        if aria_label:
-            return aria_label
-        
-        title = self.attributes.get("title")
-        if title:
-            return title
-        
-        placeholder = self.attributes.get("placeholder")
-        if placeholder:
-            return placeholder
-        
-        return f"{self.tag}_{self.attributes.get('id', 'unknown')}"
+        return self._display_name
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary representation."""
+        """Convert to dictionary representation (built from the cached fields directly)."""
+        bb = self.bounding_box
         return {
             "tag": self.tag,
             "text": self.text,
             "role": self.role,
             "visible": self.visible,
-            "bounding_box": {
-                "x": self.bounding_box.x,
-                "y": self.bounding_box.y,
-                "width": self.bounding_box.width,
-                "height": self.bounding_box.height
-            } if self.bounding_box else None,
+            # Kept as a dict: ActionResult.to_dict ships this to API clients as-is
+            "bounding_box": {"x": bb.x, "y": bb.y, "width": bb.width, "height": bb.height} if bb is not None else None,
             "attributes": self.attributes,
-            "element_type": self.element_type.value,
-            "display_name": self.display_name
+            "element_type": self._element_type.value,
+            "display_name": self._display_name
         }
@@ -0,0 +1,154 @@
+"""
+Column-oriented (SoA) view over a list of DOMElements.
+Filters work on NumPy boolean masks over contiguous columns instead of one
+Python attribute chain per element; the DOMElement objects are kept in `source`
+and gathered once, after all masks are combined.
+
+The filter/rank path is memory-bound (pointer chasing through DOMElement and
+BoundingBox objects) except for text similarity, which is compute-bound; see
+PERFORMANCE_OPTIMIZATIONS.md (Fix 8). ActionExecutor builds one batch after
+extraction and passes it through filter -> region -> ranker.
+"""
+from typing import Dict, Iterator, List, Optional, Sequence, Union
+import numpy as np
+
+from .dom_model import CLICKABLE_ROLE_IDS, DOMElement, ElementType
+
+
+class ElementBatch:
+    """Parallel NumPy columns for a fixed, ordered set of elements."""
+
+    __slots__ = (
+        "source",
+        "visible",
+        "has_bbox",
+        "x",
+        "y",
+        "width",
+        "height",
+        "area",
+        "clickable",
+        "is_input",
+        "is_select",
+        "has_label",
+        "role_clickable",
+    )
+
+    def __init__(
+        self,
+        source: List[DOMElement],
+        visible: np.ndarray,
+        has_bbox: np.ndarray,
+        x: np.ndarray,
+        y: np.ndarray,
+        width: np.ndarray,
+        height: np.ndarray,
+        clickable: np.ndarray,
+        is_input: np.ndarray,
+        is_select: np.ndarray,
+        has_label: np.ndarray,
+        role_clickable: np.ndarray,
+    ):
+        self.source = source
+        self.visible = visible
+        self.has_bbox = has_bbox
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.area = width * height
+        self.clickable = clickable
+        self.is_input = is_input
+        self.is_select = is_select
+        self.has_label = has_label
+        self.role_clickable = role_clickable
+
+    @classmethod
+    def from_elements(cls, elements: Union[Sequence[DOMElement], "ElementBatch"]) -> "ElementBatch":
+        """Build columns in a single pass over the elements (no-op for an existing batch)."""
+        if isinstance(elements, ElementBatch):
+            return elements
+        source = list(elements)
+        flags = []
+        boxes = []
+        for e in source:
+            bb = e.bounding_box
+            flags.append((
+                e.visible,
+                bb is not None,
+                e._is_clickable,
+                e._is_input,
+                e._element_type is ElementType.SELECT,
+                bool(e.text or e.aria_label),
+                e._role_id in CLICKABLE_ROLE_IDS,
+            ))
+            boxes.append((bb.x, bb.y, bb.width, bb.height) if bb is not None else (0.0, 0.0, 0.0, 0.0))
+        flag_cols = np.array(flags, dtype=bool).reshape(len(source), 7).T
+        box_cols = np.array(boxes, dtype=np.float64).reshape(len(source), 4).T
+        return cls(source, *flag_cols[:2], *box_cols, *flag_cols[2:])
+
+    def __len__(self) -> int:
+        return len(self.source)
+
+    def __iter__(self) -> Iterator[DOMElement]:
+        return iter(self.source)
+
+    def __getitem__(self, key):
+        """Integer -> DOMElement; boolean mask or index array -> compacted ElementBatch."""
+        if isinstance(key, (int, np.integer)):
+            return self.source[key]
+        idx = np.flatnonzero(key) if np.asarray(key).dtype == bool else np.asarray(key, dtype=np.intp)
+        return ElementBatch(
+            [self.source[i] for i in idx],
+            self.visible[idx],
+            self.has_bbox[idx],
+            self.x[idx],
+            self.y[idx],
+            self.width[idx],
+            self.height[idx],
+            self.clickable[idx],
+            self.is_input[idx],
+            self.is_select[idx],
+            self.has_label[idx],
+            self.role_clickable[idx],
+        )
+
+    def action_mask(self, action_type: str) -> np.ndarray:
+        """Mask of elements compatible with CLICK / TYPE / SELECT (all True otherwise)."""
+        action_type = action_type.upper()
+        if action_type == "CLICK":
+            return self.clickable
+        if action_type == "TYPE":
+            return self.is_input
+        if action_type == "SELECT":
+            return self.is_select
+        return np.ones(len(self.source), dtype=bool)
+
+    def container_mask(self, region_lower: str) -> np.ndarray:
+        """
+        Mask of elements whose (lower-cased) container contains region_lower.
+        Sibling elements share container class strings, so each distinct
+        container is tested once and the result reused.
+        """
+        hits: Dict[str, bool] = {}
+
+        def contains(container_lower: str) -> bool:
+            hit = hits.get(container_lower)
+            if hit is None:
+                hit = hits[container_lower] = bool(container_lower) and region_lower in container_lower
+            return hit
+
+        return np.fromiter(
+            (contains(e._container_lower) for e in self.source),
+            dtype=bool,
+            count=len(self.source),
+        )
+
+    def to_list(self, mask: Optional[np.ndarray] = None) -> List[DOMElement]:
+        """Gather the DOMElements selected by mask (all when None), preserving order."""
+        if mask is None:
+            return list(self.source)
+        return [self.source[i] for i in np.flatnonzero(mask)]
+
+
+ElementsLike = Union[List[DOMElement], ElementBatch]
@@ -1,188 +1,235 @@
 """
 Element filtering - applies hard constraints to reduce search space.
 No AI involved - pure deterministic logic.
+Filters evaluate as NumPy masks over an ElementBatch; lists in -> lists out, batches in -> batches out.
+apply_standard_filters takes a single fused-predicate pass over plain lists.
 """
 from typing import List
-from .dom_model import DOMElement, ElementType
+import numpy as np
+from .dom_model import ACTION_TYPE_MASKS, TAG_IDS, DOMElement, ElementType
+from .element_batch import ElementBatch, ElementsLike
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Minimum bounding-box area for apply_standard_filters (smaller is likely decorative)
+STANDARD_MIN_AREA = 10.0
+
+
+def _sized(e: DOMElement) -> bool:
+    bb = e.bounding_box
+    return bb is not None and bb.width * bb.height >= STANDARD_MIN_AREA
+
+
+def _standard_click(e: DOMElement) -> bool:
+    return e.visible and e._is_clickable and _sized(e) and bool(e.text or e.aria_label)
+
+
+def _standard_type(e: DOMElement) -> bool:
+    return e.visible and e._is_input and _sized(e)
+
+
+def _standard_select(e: DOMElement) -> bool:
+    return e.visible and e._element_type is ElementType.SELECT and _sized(e)
+
+
+def _standard_any(e: DOMElement) -> bool:
+    return e.visible and _sized(e)
+
+
+# Fused visibility -> action -> size (-> label) predicate per action, chosen once per call
+_STANDARD_PREDICATES = {
+    "CLICK": _standard_click,
+    "TYPE": _standard_type,
+    "SELECT": _standard_select,
+}
+
 
 class ElementFilter:
     """Applies deterministic filtering rules to element lists."""
     
     def __init__(self):
         self.filters_applied = []
+
+    @staticmethod
+    def _select(elements: ElementsLike, batch: ElementBatch, mask: np.ndarray) -> ElementsLike:
+        """Compact once: same container type as the caller passed in."""
+        if isinstance(elements, ElementBatch):
+            return batch[mask]
+        return batch.to_list(mask)
     
-    def filter_by_action_type(self, elements: List[DOMElement], action_type: str) -> List[DOMElement]:
+    def filter_by_action_type(self, elements: ElementsLike, action_type: str) -> ElementsLike:
         """
         Filter elements based on intended action type.
         
         Args:
-            elements: List of DOMElement objects
+            elements: List of DOMElement objects (or an ElementBatch)
             action_type: Action to perform (CLICK, TYPE, SELECT)
             
         Returns:
             Filtered list of elements
         """
         action_type = action_type.upper()
-        
-        if action_type == "CLICK":
-            filtered = [e for e in elements if e.is_clickable]
-        elif action_type == "TYPE":
-            filtered = [e for e in elements if e.is_input]
-        elif action_type == "SELECT":
-            filtered = [e for e in elements if e.element_type == ElementType.SELECT]
+        if isinstance(elements, ElementBatch):
+            filtered = elements[elements.action_mask(action_type)]
         else:
-            filtered = elements
+            # One int AND per element against the action's type bitmask
+            type_mask = ACTION_TYPE_MASKS.get(action_type, -1)
+            filtered = [e for e in elements if e._type_bit & type_mask]
         
-        logger.debug(f"Filtered by action type {action_type}: {len(filtered)}/{len(elements)}")
+        logger.debug("Filtered by action type %s: %d/%d", action_type, len(filtered), len(elements))
         return filtered
     
-    def filter_by_visibility(self, elements: List[DOMElement]) -> List[DOMElement]:
+    def filter_by_visibility(self, elements: ElementsLike) -> ElementsLike:
         """
         Filter to only visible elements.
         
         Args:
-            elements: List of DOMElement objects
+            elements: List of DOMElement objects (or an ElementBatch)
             
         Returns:
             Only visible elements
         """
-        filtered = [e for e in elements if e.visible]
-        logger.debug(f"Filtered by visibility: {len(filtered)}/{len(elements)}")
+        batch = ElementBatch.from_elements(elements)
+        filtered = self._select(elements, batch, batch.visible)
+        logger.debug("Filtered by visibility: %d/%d", len(filtered), len(elements))
         return filtered
     
-    def filter_by_region(self, elements: List[DOMElement], region_name: str) -> List[DOMElement]:
+    def filter_by_region(self, elements: ElementsLike, region_name: str) -> ElementsLike:
         """
         Filter elements by container region.
         
         Args:
-            elements: List of DOMElement objects
+            elements: List of DOMElement objects (or an ElementBatch)
             region_name: Name of container region
             
         Returns:
             Elements within specified region
         """
-        filtered = [
-            e for e in elements 
-            if e.container and region_name.lower() in e.container.lower()
-        ]
+        batch = ElementBatch.from_elements(elements)
+        filtered = self._select(elements, batch, batch.container_mask(region_name.lower()))
         
-        logger.debug(f"Filtered by region '{region_name}': {len(filtered)}/{len(elements)}")
+        logger.debug("Filtered by region '%s': %d/%d", region_name, len(filtered), len(elements))
         return filtered
     
     def filter_by_position(
         self, 
-        elements: List[DOMElement], 
+        elements: ElementsLike, 
         min_y: float = 0, 
         max_y: float = float('inf')
-    ) -> List[DOMElement]:
+    ) -> ElementsLike:
         """
         Filter elements by vertical position on page.
         
         Args:
-            elements: List of DOMElement objects
+            elements: List of DOMElement objects (or an ElementBatch)
             min_y: Minimum Y coordinate
             max_y: Maximum Y coordinate
             
         Returns:
             Elements within Y range
         """
-        filtered = [
-            e for e in elements 
-            if e.bounding_box and min_y <= e.bounding_box.y <= max_y
-        ]
+        batch = ElementBatch.from_elements(elements)
+        filtered = self._select(elements, batch, batch.has_bbox & (batch.y >= min_y) & (batch.y <= max_y))
         
-        logger.debug(f"Filtered by position: {len(filtered)}/{len(elements)}")
+        logger.debug("Filtered by position: %d/%d", len(filtered), len(elements))
         return filtered
     
     def filter_by_size(
         self, 
-        elements: List[DOMElement], 
+        elements: ElementsLike, 
         min_area: float = 10.0
-    ) -> List[DOMElement]:
+    ) -> ElementsLike:
         """
         Filter out elements that are too small (likely decorative).
         
         Args:
-            elements: List of DOMElement objects
+            elements: List of DOMElement objects (or an ElementBatch)
             min_area: Minimum element area in pixels
             
         Returns:
             Elements above minimum size
         """
-        filtered = [
-            e for e in elements 
-            if e.bounding_box and e.bounding_box.area >= min_area
-        ]
+        batch = ElementBatch.from_elements(elements)
+        filtered = self._select(elements, batch, batch.has_bbox & (batch.area >= min_area))
         
-        logger.debug(f"Filtered by size: {len(filtered)}/{len(elements)}")
+        logger.debug("Filtered by size: %d/%d", len(filtered), len(elements))
         return filtered
     
-    def filter_empty_text(self, elements: List[DOMElement]) -> List[DOMElement]:
+    def filter_empty_text(self, elements: ElementsLike) -> ElementsLike:
         """
         Filter out elements with no text or label.
         
         Args:
-            elements: List of DOMElement objects
+            elements: List of DOMElement objects (or an ElementBatch)
             
         Returns:
             Elements with text or aria-label
         """
-        filtered = [
-            e for e in elements 
-            if e.text or e.attributes.get("aria_label")
-        ]
+        batch = ElementBatch.from_elements(elements)
+        filtered = self._select(elements, batch, batch.has_label)
         
-        logger.debug(f"Filtered empty text: {len(filtered)}/{len(elements)}")
+        logger.debug("Filtered empty text: %d/%d", len(filtered), len(elements))
         return filtered
     
-    def filter_by_tag(self, elements: List[DOMElement], allowed_tags: List[str]) -> List[DOMElement]:
+    def filter_by_tag(self, elements: ElementsLike, allowed_tags: List[str]) -> ElementsLike:
         """
         Filter to only allowed HTML tags.
         
         Args:
-            elements: List of DOMElement objects
+            elements: List of DOMElement objects (or an ElementBatch)
             allowed_tags: List of allowed tag names
             
         Returns:
             Elements with allowed tags
         """
-        allowed_tags_upper = [tag.upper() for tag in allowed_tags]
-        filtered = [
-            e for e in elements 
-            if e.tag.upper() in allowed_tags_upper
-        ]
-        
-        logger.debug(f"Filtered by tags: {len(filtered)}/{len(elements)}")
+        # Known tags compare as ints; tags outside TAG_IDS fall back to a name check
+        allowed_ids = frozenset(TAG_IDS[t.lower()] for t in allowed_tags if t.lower() in TAG_IDS)
+        other_tags = frozenset(t.upper() for t in allowed_tags if t.lower() not in TAG_IDS)
+        batch = ElementBatch.from_elements(elements)
+        mask = np.fromiter(
+            (
+                e._tag_id in allowed_ids
+                or (e._tag_id == 0 and bool(other_tags) and e.tag.upper() in other_tags)
+                for e in batch
+            ),
+            dtype=bool,
+            count=len(batch),
+        )
+        filtered = self._select(elements, batch, mask)
+        
+        logger.debug("Filtered by tags: %d/%d", len(filtered), len(elements))
         return filtered
     
     def apply_standard_filters(
         self, 
-        elements: List[DOMElement], 
+        elements: ElementsLike, 
         action_type: str
-    ) -> List[DOMElement]:
+    ) -> ElementsLike:
         """
         Apply standard filter chain for an action.
         
         Args:
-            elements: List of DOMElement objects
+            elements: List of DOMElement objects (or an ElementBatch)
             action_type: Action to perform
             
         Returns:
             Filtered elements ready for ranking
         """
-        filtered = elements
-        
-        # Chain filters
-        filtered = self.filter_by_visibility(filtered)
-        filtered = self.filter_by_action_type(filtered, action_type)
-        filtered = self.filter_by_size(filtered)
-        
-        if action_type.upper() == "CLICK":
-            filtered = self.filter_empty_text(filtered)
+        action_type = action_type.upper()
+        if isinstance(elements, ElementBatch):
+            # Fuse visibility -> action type -> size (-> non-empty text) into one mask, compact once
+            mask = (
+                elements.visible & elements.action_mask(action_type)
+                & elements.has_bbox & (elements.area >= STANDARD_MIN_AREA)
+            )
+            if action_type == "CLICK":
+                mask &= elements.has_label
+            filtered = elements[mask]
+        else:
+            # Plain list: one pass with the action's fused predicate, no column build
+            predicate = _STANDARD_PREDICATES.get(action_type, _standard_any)
+            filtered = [e for e in elements if predicate(e)]
         
-        logger.info(f"Standard filters applied: {len(elements)} -> {len(filtered)} elements")
+        logger.info("Standard filters applied: %d -> %d elements", len(elements), len(filtered))
         return filtered
@@ -5,16 +5,33 @@ Supports long product names: substring match, keyword overlap, parent text.
 """
 import re
 from difflib import SequenceMatcher
-from typing import List, Tuple, Optional
+from functools import lru_cache
+from typing import FrozenSet, List, Tuple, Optional, Sequence
 import logging
-from .dom_model import DOMElement
+import numpy as np
+from .dom_model import CLICKABLE_ROLE_IDS, DOMElement
+from .element_batch import ElementBatch, ElementsLike
 
 logger = logging.getLogger(__name__)
 
+try:
+    # C++ bit-parallel Indel distance; same 2*M/T form as SequenceMatcher.ratio()
+    from rapidfuzz import process as _rf_process
+    from rapidfuzz.distance import Indel as _Indel
+except ImportError:
+    _rf_process = None
+    _Indel = None
+
+# Slack for float rounding when comparing an upper bound against a threshold
+_SCORE_EPSILON = 1e-9
+
+# Below this many texts, thread start-up costs more than the similarity work it would split
+_PARALLEL_MIN_CHOICES = 128
+
 
 def text_similarity(a: str, b: str) -> float:
     """
-    Calculate text similarity using sequence matcher.
+    Calculate text similarity (rapidfuzz Indel ratio when installed, else difflib).
     
     Args:
         a: First string
@@ -25,18 +42,139 @@ def text_similarity(a: str, b: str) -> float:
     """
     if not a or not b:
         return 0.0
+    if _Indel is not None:
+        return _Indel.normalized_similarity(a.lower(), b.lower())
     return SequenceMatcher(None, a.lower(), b.lower()).ratio()
 
 
+def target_matcher(target_text: str) -> SequenceMatcher:
+    """
+    SequenceMatcher with the lower-cased target as seq2.
+    difflib indexes seq2 once and keeps it across set_seq1 calls, so ranking
+    N elements against one target builds that index once instead of N times.
+    """
+    matcher = SequenceMatcher(None)
+    matcher.set_seq2((target_text or "").lower())
+    return matcher
+
+
+def _matcher_similarity(matcher: SequenceMatcher, a_lower: str) -> float:
+    """text_similarity(a, target) for the target held by matcher; a_lower is already lower-cased."""
+    if not a_lower or not matcher.b:
+        return 0.0
+    if _Indel is not None:
+        return _Indel.normalized_similarity(a_lower, matcher.b)
+    matcher.set_seq1(a_lower)
+    return matcher.ratio()
+
+
+def _indel_column(choices_lower: List[str], target_lower: str) -> np.ndarray:
+    """
+    Indel ratio of every (lower-cased) choice against the target via rapidfuzz cdist.
+    Large columns are split across all cores by cdist's own GIL-free thread pool.
+    """
+    workers = -1 if len(choices_lower) >= _PARALLEL_MIN_CHOICES else 1
+    sims = _rf_process.cdist(
+        choices_lower, [target_lower], scorer=_Indel.normalized_similarity, dtype=np.float64,
+        workers=workers,
+    )[:, 0]
+    empty = np.fromiter((not c for c in choices_lower), dtype=bool, count=len(choices_lower))
+    sims[empty] = 0.0
+    return sims
+
+
+def similarity_column(choices: Sequence[str], target: str) -> np.ndarray:
+    """
+    text_similarity(choice, target) for every choice, as a float64 array.
+    One rapidfuzz cdist call when installed; otherwise one difflib matcher reused for all choices.
+    """
+    target_lower = (target or "").lower()
+    choices_lower = [(c or "").lower() for c in choices]
+    if not target_lower:
+        return np.zeros(len(choices_lower), dtype=np.float64)
+    if _rf_process is not None:
+        return _indel_column(choices_lower, target_lower)
+    matcher = target_matcher(target_lower)
+    return np.fromiter(
+        (_matcher_similarity(matcher, c) for c in choices_lower), dtype=np.float64, count=len(choices_lower)
+    )
+
+
+
+def best_similarity_index(
+    choices: Sequence[str],
+    target: str,
+    bonus: Optional[np.ndarray] = None
+) -> Tuple[int, float]:
+    """
+    (index, score) of the first maximum of similarity_column(choices, target) + bonus.
+    Without rapidfuzz, difflib's O(1) / O(n) upper bounds (real_quick_ratio, quick_ratio)
+    skip the full ratio() for choices that cannot beat the best so far; same result.
+    """
+    if _rf_process is not None or not target:
+        scores = similarity_column(choices, target)
+        if bonus is not None:
+            scores += bonus
+        best = int(np.argmax(scores))
+        return best, float(scores[best])
+    matcher = target_matcher(target)
+    best, best_score = 0, float("-inf")
+    for i, choice in enumerate(choices):
+        extra = float(bonus[i]) if bonus is not None else 0.0
+        choice_lower = (choice or "").lower()
+        if not choice_lower:
+            score = 0.0 + extra
+        else:
+            matcher.set_seq1(choice_lower)
+            # A later choice must be strictly better to replace the first maximum
+            if matcher.real_quick_ratio() + extra <= best_score or matcher.quick_ratio() + extra <= best_score:
+                continue
+            score = matcher.ratio() + extra
+        if score > best_score:
+            best, best_score = i, score
+    return best, best_score
+
+
+# Split on spaces, commas, parens; keep alphanumeric + dots (e.g. 1.5)
+# A single character class never backtracks, so the stdlib engine is already linear-time here
+_TOKEN_RE = re.compile(r"[a-zA-Z0-9.]+")
+
+
 def _significant_tokens(text: str, min_len: int = 2) -> List[str]:
     """Extract significant tokens (skip tiny words, keep numbers and model parts)."""
     if not text:
         return []
-    # Split on spaces, commas, parens; keep alphanumeric + dots (e.g. 1.5)
-    tokens = re.findall(r"[a-zA-Z0-9.]+", text.lower())
+    tokens = _TOKEN_RE.findall(text.lower())
     return [t for t in tokens if len(t) >= min_len or t.isdigit() or (t.replace(".", "").isdigit())]
 
 
+def _match_texts(element: DOMElement) -> Tuple[str, str, str, str]:
+    """
+    (element text, placeholder, aria-label, combined text), lower-cased and stripped.
+    None of these depend on the target, so they are built once per element and
+    cached on it instead of being rebuilt on every rank call.
+    """
+    cached = element._match_texts
+    if cached is None:
+        element_text = element._text_lower.strip()
+        # Use element + parent text (product cards often have title in parent/children)
+        parent_text = (element.parent_text or "").lower().strip()
+        # For inputs, include placeholder and aria-label (e.g. "Search" matches placeholder "Search products")
+        placeholder = (element.placeholder or "").lower().strip()
+        aria_label = element._aria_lower.strip()
+        combined_text = (element_text + " " + parent_text + " " + placeholder + " " + aria_label).strip()[:600]
+        if not combined_text:
+            combined_text = element_text
+        cached = element._match_texts = (element_text, placeholder, aria_label, combined_text)
+    return cached
+
+
+@lru_cache(maxsize=4096)
+def _token_set(text: str) -> FrozenSet[str]:
+    """Memoized set of _significant_tokens(text); element texts repeat across rank calls."""
+    return frozenset(_significant_tokens(text))
+
+
 class ElementRanker:
     """
     Enterprise-grade element ranking with multi-factor scoring.
@@ -69,181 +207,453 @@ class ElementRanker:
             threshold: Minimum score threshold for acceptance (short targets)
         """
         self.threshold = threshold
+        # Weights snapshotted once (subclass overrides included) and unpacked into locals
+        # by the scorers, instead of a class-attribute lookup per term per element
+        self._weights = (
+            self.WEIGHT_EXACT_MATCH,
+            self.WEIGHT_SEMANTIC_SIMILARITY,
+            self.WEIGHT_SUBSTRING_MATCH,
+            self.WEIGHT_KEYWORD_OVERLAP,
+            self.WEIGHT_ROLE_MATCH,
+            self.WEIGHT_ARIA_LABEL,
+            self.WEIGHT_VISIBILITY,
+            self.WEIGHT_POSITION_BIAS,
+            self.WEIGHT_CONTAINER_CONTEXT,
+        )
 
     def _effective_threshold(self, target_text: str) -> float:
         if len((target_text or "").strip()) > self.LONG_TARGET_LEN:
             return self.LONG_TARGET_THRESHOLD
         return self.threshold
     
-    def score_element(
-        self, 
-        element: DOMElement, 
-        target_text: str,
-        region_context: Optional[str] = None,
-        historical_success: bool = False
-    ) -> float:
+    def _lexical_score(
+        self,
+        element: DOMElement,
+        target_lower: str,
+        target_tokens: List[str],
+        target_token_set: FrozenSet[str]
+    ) -> Tuple[float, str]:
         """
-        Calculate comprehensive score for element match.
+        Exact / substring / keyword-overlap components of score_element (steps 1-3).
         
-        Args:
-            element: DOMElement to score
-            target_text: Target text to match against
-            region_context: Expected container region
-            historical_success: Whether this element succeeded before
-            
         Returns:
-            Score between 0.0 and 1.0
+            (partial score, combined element text used by the similarity steps)
         """
+        (w_exact, w_sem, w_substr, w_keyword, w_role, w_aria, w_vis, w_pos, w_ctx) = self._weights
         score = 0.0
-        target_lower = target_text.lower().strip()
-        element_text = (element.text or "").lower().strip()
-        # Use element + parent text (product cards often have title in parent/children)
-        parent_text = (element.parent_text or "").lower().strip()
-        # For inputs, include placeholder and aria-label (e.g. "Search" matches placeholder "Search products")
-        placeholder = (element.attributes.get("placeholder") or "").lower().strip()
-        aria_label = (element.attributes.get("aria_label") or "").lower().strip()
-        combined_text = (element_text + " " + parent_text + " " + placeholder + " " + aria_label).strip()[:600]
-        if not combined_text:
-            combined_text = element_text
+        element_text, placeholder, aria_label, combined_text = _match_texts(element)
         
         # 1. EXACT MATCH (highest weight)
         if element_text == target_lower:
-            score += self.WEIGHT_EXACT_MATCH
-            logger.debug(f"Exact match bonus: {self.WEIGHT_EXACT_MATCH}")
+            score += w_exact
+        
+        # One scan of the combined text, reused by 2a and 2c
+        in_combined = combined_text.find(target_lower) >= 0
         
         # 2a. Substring dominance: target in element text (product title in DOM may be truncated)
-        if target_lower and combined_text and target_lower in combined_text:
+        if target_lower and combined_text and in_combined:
             score += 0.5
-            logger.debug("Substring dominance: target in element/parent/placeholder/aria +0.5")
         elif target_lower and element_text and target_lower in element_text:
             score += 0.5
-            logger.debug("Substring dominance: target in element text +0.5")
 
         # 2b. Placeholder/aria contains target (e.g. "Search" in placeholder "Search products")
         if target_lower and (target_lower in placeholder or target_lower in aria_label):
-            score += self.WEIGHT_SUBSTRING_MATCH
-            logger.debug(f"Target in placeholder/aria: +{self.WEIGHT_SUBSTRING_MATCH}")
+            score += w_substr
 
         # 2c. SUBSTRING / CONTAINS (for long product names; page often shows truncated)
         if len(target_lower) >= self.MIN_SUBSTRING_LEN or len(combined_text) >= self.MIN_SUBSTRING_LEN:
-            if target_lower in combined_text:
-                score += self.WEIGHT_SUBSTRING_MATCH
-                logger.debug(f"Target in element/parent: +{self.WEIGHT_SUBSTRING_MATCH}")
+            if in_combined:
+                score += w_substr
             elif combined_text in target_lower:
-                score += self.WEIGHT_SUBSTRING_MATCH
-                logger.debug(f"Element/parent in target: +{self.WEIGHT_SUBSTRING_MATCH}")
+                score += w_substr
             else:
                 # Substantial overlap: first N chars of target in combined (truncated product name)
                 n = min(len(target_lower), len(combined_text), 80)
                 if n >= self.MIN_SUBSTRING_LEN and (target_lower[:n] in combined_text or combined_text[:n] in target_lower):
-                    score += self.WEIGHT_SUBSTRING_MATCH * 0.8
-                    logger.debug(f"Substring overlap: +{self.WEIGHT_SUBSTRING_MATCH * 0.8}")
+                    score += w_substr * 0.8
         
         # 3. KEYWORD OVERLAP (e.g. "LG", "5 Star", "1.5", "Split AC", "Gold Fin", "2025")
-        target_tokens = _significant_tokens(target_text)
         if target_tokens:
-            combined_tokens = set(_significant_tokens(combined_text))
-            matches = sum(1 for t in target_tokens if t in combined_tokens)
+            combined_tokens = _token_set(combined_text)
+            if len(target_token_set) == len(target_tokens):
+                # No repeated target tokens: one C-level set intersection instead of a generator loop
+                matches = len(target_token_set & combined_tokens)
+            else:
+                # Repeated target tokens count once per occurrence
+                matches = sum(1 for t in target_tokens if t in combined_tokens)
             ratio = matches / len(target_tokens)
-            score += ratio * self.WEIGHT_KEYWORD_OVERLAP
-            logger.debug(f"Keyword overlap {matches}/{len(target_tokens)}: +{ratio * self.WEIGHT_KEYWORD_OVERLAP}")
+            score += ratio * w_keyword
+        
+        return score, combined_text
+    
+    def score_element(
+        self, 
+        element: DOMElement, 
+        target_text: str,
+        region_context: Optional[str] = None,
+        historical_success: bool = False,
+        matcher: Optional[SequenceMatcher] = None,
+        early_exit_threshold: Optional[float] = None,
+        target_tokens: Optional[List[str]] = None
+    ) -> float:
+        """
+        Calculate comprehensive score for element match.
+        
+        Args:
+            element: DOMElement to score
+            target_text: Target text to match against
+            region_context: Expected container region
+            historical_success: Whether this element succeeded before
+            matcher: Reusable target_matcher(target_text) when scoring many elements
+            early_exit_threshold: If set and the best score still reachable after the
+                cheap components is below it, skip the similarity components and
+                return the partial (lower-bound) score
+            target_tokens: Precomputed _significant_tokens(target_text) when scoring many elements
+            
+        Returns:
+            Score between 0.0 and 1.0
+        """
+        # Target-only invariants; callers scoring many elements can pass matcher/target_tokens
+        if matcher is None:
+            matcher = target_matcher(target_text)
+        if target_tokens is None:
+            target_tokens = _significant_tokens(target_text)
+        return self._score_element_cached(
+            element,
+            target_text.lower().strip(),
+            target_tokens,
+            frozenset(target_tokens),
+            matcher,
+            region_context.lower() if region_context else None,
+            historical_success,
+            early_exit_threshold,
+        )
+    
+    def _score_element_cached(
+        self,
+        element: DOMElement,
+        target_lower: str,
+        target_tokens: List[str],
+        target_token_set: FrozenSet[str],
+        matcher: SequenceMatcher,
+        region_lower: Optional[str],
+        historical_success: bool,
+        early_exit_threshold: Optional[float]
+    ) -> float:
+        """score_element body with the target / region preprocessing already done."""
+        (w_exact, w_sem, w_substr, w_keyword, w_role, w_aria, w_vis, w_pos, w_ctx) = self._weights
+        score, combined_text = self._lexical_score(element, target_lower, target_tokens, target_token_set)
+        lexical = score
+        
+        # O(1) components, evaluated up front so the upper bound is known before similarity
+        role_match = element._role_id in CLICKABLE_ROLE_IDS
+        aria_raw = element.aria_label or ""
+        above_fold = bool(element.bounding_box and element.bounding_box.y < 800)
+        in_region = bool(
+            region_lower and element._container_lower
+            and region_lower in element._container_lower
+        )
+        if early_exit_threshold is not None:
+            upper_bound = (
+                score
+                + w_sem
+                + (w_role if role_match else 0.0)
+                + (w_aria if aria_raw else 0.0)
+                + (w_vis if element.visible else 0.0)
+                + (w_pos if above_fold else 0.0)
+                + (w_ctx if in_region else 0.0)
+                + (0.05 if historical_success else 0.0)
+            )
+            if upper_bound + _SCORE_EPSILON < early_exit_threshold:
+                return min(score, 1.0)
         
         # 4. SEMANTIC SIMILARITY (use combined text so parent helps)
-        text_sim = text_similarity(combined_text, target_text)
-        score += text_sim * self.WEIGHT_SEMANTIC_SIMILARITY
-        logger.debug(f"Text similarity score: {text_sim * self.WEIGHT_SEMANTIC_SIMILARITY}")
+        text_sim = _matcher_similarity(matcher, combined_text)
+        score += text_sim * w_sem
         
         # 6. ROLE MATCH
-        if element.role in ["button", "link"]:
-            score += self.WEIGHT_ROLE_MATCH
-            logger.debug(f"Role match bonus: {self.WEIGHT_ROLE_MATCH}")
+        if role_match:
+            score += w_role
         
         # 7. ARIA LABEL MATCH
-        aria_label = element.attributes.get("aria_label", "")
-        if aria_label:
-            aria_sim = text_similarity(aria_label, target_text)
-            score += aria_sim * self.WEIGHT_ARIA_LABEL
-            logger.debug(f"Aria label score: {aria_sim * self.WEIGHT_ARIA_LABEL}")
+        aria_sim = 0.0
+        if aria_raw:
+            aria_sim = _matcher_similarity(matcher, element._aria_lower)
+            score += aria_sim * w_aria
         
         # 8. VISIBILITY (should always be true after filtering)
         if element.visible:
-            score += self.WEIGHT_VISIBILITY
+            score += w_vis
         
         # 9. POSITION BIAS (prefer elements in upper part of page)
-        if element.bounding_box:
-            if element.bounding_box.y < 800:
-                score += self.WEIGHT_POSITION_BIAS
-                logger.debug(f"Position bias bonus: {self.WEIGHT_POSITION_BIAS}")
+        if above_fold:
+            score += w_pos
         
         # 10. CONTAINER CONTEXT
-        if region_context and element.container:
-            if region_context.lower() in element.container.lower():
-                score += self.WEIGHT_CONTAINER_CONTEXT
-                logger.debug(f"Container context bonus: {self.WEIGHT_CONTAINER_CONTEXT}")
+        if in_region:
+            score += w_ctx
         
         # 11. HISTORICAL SUCCESS (bonus, not part of base weights)
         if historical_success:
             score += 0.05
-            logger.debug("Historical success bonus: 0.05")
+        
+        # One summary line; arguments are only formatted when DEBUG is enabled
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Score components for '%s': lexical=%.3f text_sim=%.3f role=%s aria_sim=%.3f "
+                "visible=%s above_fold=%s region=%s history=%s -> %.3f",
+                element.display_name, lexical, text_sim, role_match, aria_sim,
+                element.visible, above_fold, in_region, historical_success, score,
+            )
         
         return min(score, 1.0)  # Cap at 1.0
     
+    def score_batch(
+        self,
+        batch: ElementBatch,
+        target_text: str,
+        region_context: Optional[str] = None,
+        historical: Optional[Sequence[bool]] = None,
+        early_exit_threshold: Optional[float] = None,
+        best_only: bool = False
+    ) -> np.ndarray:
+        """
+        score_element over a whole ElementBatch.
+        Text-dependent components (steps 1-4, aria similarity) run once per element;
+        role / visibility / position / container / history are column operations.
+        Terms are added in score_element's order, so scores are identical.
+        
+        Args:
+            batch: ElementBatch to score
+            target_text: Target text to match against
+            region_context: Expected container region
+            historical: Per-element historical success flags (aligned with batch)
+            early_exit_threshold: As in score_element; pruned elements keep their partial score
+            best_only: Caller only needs the first highest-scoring element. Once some element is
+                certain to reach the 1.0 cap, later elements (and earlier ones that cannot reach
+                1.0) skip the similarity components and keep their partial score
+            
+        Returns:
+            float64 array of scores between 0.0 and 1.0, aligned with batch
+        """
+        n = len(batch)
+        (w_exact, w_sem, w_substr, w_keyword, w_role, w_aria, w_vis, w_pos, w_ctx) = self._weights
+        matcher = target_matcher(target_text)
+        target_lower = target_text.lower().strip()
+        target_tokens = _significant_tokens(target_text)
+        target_token_set = frozenset(target_tokens)
+        
+        lexical = np.empty(n, dtype=np.float64)
+        combined: List[str] = []
+        for i, element in enumerate(batch.source):
+            lexical[i], combined_text = self._lexical_score(
+                element, target_lower, target_tokens, target_token_set
+            )
+            combined.append(combined_text)
+        
+        aria = [e._aria_lower for e in batch.source]
+        has_aria = np.fromiter((bool(a) for a in aria), dtype=bool, count=n)
+        above_fold = batch.has_bbox & (batch.y < 800)
+        if region_context:
+            in_region = batch.container_mask(region_context.lower())
+        else:
+            in_region = np.zeros(n, dtype=bool)
+        hist = np.asarray(historical, dtype=bool) if historical is not None else np.zeros(n, dtype=bool)
+        
+        # Constant-weight terms, added in place where their mask is set (no temporaries)
+        role_mask = batch.role_clickable
+        vis_mask = batch.visible
+        constant_terms = (
+            (w_role, role_mask), (w_vis, vis_mask), (w_pos, above_fold), (w_ctx, in_region), (0.05, hist),
+        )
+        
+        def bound(start: np.ndarray, aria_weight: float) -> np.ndarray:
+            # start + every constant term that applies (+ aria weight where an aria-label exists)
+            out = start.copy()
+            np.add(out, aria_weight, out=out, where=has_aria)
+            for weight, mask in constant_terms:
+                np.add(out, weight, out=out, where=mask)
+            return out
+        
+        live = np.ones(n, dtype=bool)
+        if early_exit_threshold is not None or best_only:
+            # Best reachable score: both similarity terms at their maximum
+            upper_bound = bound(lexical + w_sem, w_aria)
+            if early_exit_threshold is not None:
+                live = upper_bound + _SCORE_EPSILON >= early_exit_threshold
+            if best_only and n:
+                # Similarity terms are >= 0, so lexical + constant terms is a lower bound
+                certain = np.flatnonzero(bound(lexical, 0.0) >= 1.0)
+                if len(certain):
+                    # Element `first` ends at the 1.0 cap. Only earlier elements that can also reach
+                    # 1.0 could tie it (and win on input order); later ones are irrelevant
+                    first = certain[0]
+                    contender = upper_bound + _SCORE_EPSILON >= 1.0
+                    contender[first + 1:] = False
+                    contender[first] = True
+                    live &= contender
+        
+        text_term = np.zeros(n, dtype=np.float64)
+        aria_term = np.zeros(n, dtype=np.float64)
+        live_idx = np.flatnonzero(live)
+        if _rf_process is not None and matcher.b and len(live_idx):
+            # One C call per column instead of a Python loop; empty strings score 0 as in text_similarity
+            text_term[live_idx] = _indel_column([combined[i] for i in live_idx], matcher.b) \
+                * w_sem
+            aria_term[live_idx] = _indel_column([aria[i] for i in live_idx], matcher.b) \
+                * w_aria
+        else:
+            for i in live_idx:
+                text_term[i] = _matcher_similarity(matcher, combined[i]) * w_sem
+                if aria[i]:
+                    aria_term[i] = _matcher_similarity(matcher, aria[i]) * w_aria
+        
+        # Same addition order as score_element, so results are bit-identical
+        scores = lexical + text_term
+        np.add(scores, w_role, out=scores, where=role_mask)
+        scores += aria_term
+        np.add(scores, w_vis, out=scores, where=vis_mask)
+        np.add(scores, w_pos, out=scores, where=above_fold)
+        np.add(scores, w_ctx, out=scores, where=in_region)
+        np.add(scores, 0.05, out=scores, where=hist)
+        np.copyto(scores, lexical, where=~live)
+        return np.minimum(scores, 1.0, out=scores)
+    
     def rank_elements(
         self, 
-        elements: List[DOMElement], 
+        elements: ElementsLike, 
         target_text: str,
         region_context: Optional[str] = None,
-        history_lookup: Optional[dict] = None
+        history_lookup: Optional[dict] = None,
+        top_n: Optional[int] = None
     ) -> List[Tuple[float, DOMElement]]:
         """
         Rank elements by match score.
         
         Args:
-            elements: List of DOMElement objects
+            elements: List of DOMElement objects (or an ElementBatch)
             target_text: Target text to match
             region_context: Optional region context
-            history_lookup: Optional history of successful elements
+            history_lookup: Optional history of successful elements, keyed by
+                DOMElement.history_key (tag, text, id); legacy "tag_text_id" keys still work
+            top_n: If set, only the best top_n are selected (partial selection, no full sort)
             
         Returns:
             List of (score, element) tuples, sorted by score descending
         """
+        if top_n is not None:
+            top_n = max(top_n, 0)
+        return self._rank(elements, target_text, region_context, history_lookup, top_n)
+    
+    def rank_top_n(
+        self,
+        elements: ElementsLike,
+        target_text: str,
+        top_n: int,
+        region_context: Optional[str] = None,
+        history_lookup: Optional[dict] = None
+    ) -> List[Tuple[float, DOMElement]]:
+        """
+        Same as rank_elements(...)[:top_n], but selects the top N with np.argpartition
+        instead of sorting every accepted element.
+        
+        Args:
+            elements: List of DOMElement objects (or an ElementBatch)
+            target_text: Target text to match
+            top_n: Number of ranked elements to return
+            region_context: Optional region context
+            history_lookup: Optional history of successful elements, keyed by
+                DOMElement.history_key (tag, text, id); legacy "tag_text_id" keys still work
+            
+        Returns:
+            Up to top_n (score, element) tuples, sorted by score descending
+        """
+        return self.rank_elements(elements, target_text, region_context, history_lookup, top_n=top_n)
+    
+    @staticmethod
+    def _ordered_indices(scores: np.ndarray, threshold: float, top_n: Optional[int]) -> np.ndarray:
+        """
+        Indices with score >= threshold, best first; equal scores keep input order
+        (what a stable descending sort gives). With top_n, only the first top_n.
+        """
+        accepted = np.flatnonzero(scores >= threshold)
+        if top_n is not None and len(accepted) > top_n:
+            if top_n == 0:
+                return accepted[:0]
+            accepted_scores = scores[accepted]
+            cut = len(accepted) - top_n
+            kth = np.partition(accepted_scores, cut)[cut]  # top_n-th largest score
+            above = accepted[accepted_scores > kth]
+            ties = accepted[accepted_scores == kth][:top_n - len(above)]
+            accepted = np.concatenate((above, ties))
+        return accepted[np.lexsort((accepted, -scores[accepted]))]
+    
+    def _rank(
+        self,
+        elements: ElementsLike,
+        target_text: str,
+        region_context: Optional[str],
+        history_lookup: Optional[dict],
+        top_n: Optional[int]
+    ) -> List[Tuple[float, DOMElement]]:
+        """Shared body of rank_elements / rank_top_n (top_n=None ranks everything)."""
         # For long targets (e.g. product names), use a lower fallback threshold if none pass
         fallback_threshold = 0.40
         use_fallback = len((target_text or "").strip()) > 50
         effective_threshold = self._effective_threshold(target_text)
+        # Lowest score that can still be accepted (fallbacks included); anything that
+        # cannot reach it skips the similarity components entirely
+        if use_fallback or len(elements) <= 5:
+            prune_below = min(effective_threshold, fallback_threshold)
+        else:
+            prune_below = effective_threshold
         
-        scored_all: List[Tuple[float, DOMElement]] = []
-        for element in elements:
-            historical_success = False
-            if history_lookup:
-                element_key = f"{element.tag}_{element.text}_{element.attributes.get('id', '')}"
-                historical_success = history_lookup.get(element_key, False)
-            score = self.score_element(
-                element, target_text, region_context, historical_success
-            )
-            scored_all.append((score, element))
-            if score >= self.threshold:
-                logger.debug(f"Element '{element.display_name}' scored {score:.3f}")
+        historical = None
+        if history_lookup:
+            if isinstance(next(iter(history_lookup)), str):
+                # Legacy "tag_text_id" string keys can't be split back reliably (text and id may
+                # contain "_"), so match them as strings
+                historical = [
+                    bool(history_lookup.get(f"{e.tag}_{e.text}_{e.element_id or ''}", False))
+                    for e in elements
+                ]
+            else:
+                historical = [
+                    bool(history_lookup.get(e.history_key, False))
+                    for e in elements
+                ]
+        batch = ElementBatch.from_elements(elements)
+        scores = self.score_batch(
+            batch, target_text, region_context, historical,
+            early_exit_threshold=prune_below, best_only=top_n == 1,
+        )
+        if logger.isEnabledFor(logging.DEBUG):
+            for i in np.flatnonzero(scores >= self.threshold):
+                logger.debug("Element '%s' scored %.3f", batch.source[i].display_name, scores[i])
         
-        scored_all.sort(key=lambda x: x[0], reverse=True)
-        scored_elements = [(s, e) for s, e in scored_all if s >= effective_threshold]
-
-        # Long target fallback: if no one passed, accept best candidate above fallback_threshold
-        if not scored_elements and use_fallback and scored_all and scored_all[0][0] >= fallback_threshold:
-            best_score, best_elem = scored_all[0]
-            scored_elements = [(best_score, best_elem)]
-            logger.info(
-                f"Long target: no element above {self.threshold}; using best match "
-                f"'{best_elem.display_name[:50]}...' with score {best_score:.3f} (>= {fallback_threshold})"
-            )
-        # Few-candidates fallback: e.g. 1–2 inputs (Search, Pincode) – use best if score >= 0.35
-        if not scored_elements and len(elements) <= 5 and scored_all and scored_all[0][0] >= fallback_threshold:
-            best_score, best_elem = scored_all[0]
-            scored_elements = [(best_score, best_elem)]
-            logger.info(
-                f"Few candidates ({len(elements)}): using best match '{best_elem.display_name[:50]}' "
-                f"with score {best_score:.3f} (>= {fallback_threshold})"
-            )
+        source = batch.source
+        scored_elements = [
+            (scores[i].item(), source[i])
+            for i in self._ordered_indices(scores, effective_threshold, top_n)
+        ]
+        
+        if not scored_elements and len(scores) and top_n != 0:
+            best = int(np.argmax(scores))  # first of equal maxima, as with a stable sort
+            best_score, best_elem = scores[best].item(), source[best]
+            # Long target fallback: if no one passed, accept best candidate above fallback_threshold
+            if use_fallback and best_score >= fallback_threshold:
+                scored_elements = [(best_score, best_elem)]
+                logger.info(
+                    "Long target: no element above %s; using best match '%s...' with score %.3f (>= %s)",
+                    self.threshold, best_elem.display_name[:50], best_score, fallback_threshold
+                )
+            # Few-candidates fallback: e.g. 1–2 inputs (Search, Pincode) – use best if score >= 0.35
+            elif len(elements) <= 5 and best_score >= fallback_threshold:
+                scored_elements = [(best_score, best_elem)]
+                logger.info(
+                    "Few candidates (%d): using best match '%s' with score %.3f (>= %s)",
+                    len(elements), best_elem.display_name[:50], best_score, fallback_threshold
+                )
         
         logger.info(
             "Ranked %d/%d elements above threshold %s",
@@ -253,7 +663,7 @@ class ElementRanker:
     
     def get_top_candidates(
         self, 
-        elements: List[DOMElement], 
+        elements: ElementsLike, 
         target_text: str,
         top_n: int = 3,
         region_context: Optional[str] = None
@@ -262,7 +672,7 @@ class ElementRanker:
         Get top N candidate elements.
         
         Args:
-            elements: List of DOMElement objects
+            elements: List of DOMElement objects (or an ElementBatch)
             target_text: Target text to match
             top_n: Number of top candidates to return
             region_context: Optional region context
@@ -270,15 +680,15 @@ class ElementRanker:
         Returns:
             List of top candidate elements
         """
-        ranked = self.rank_elements(elements, target_text, region_context)
-        top_candidates = [elem for score, elem in ranked[:top_n]]
+        ranked = self.rank_top_n(elements, target_text, top_n, region_context)
+        top_candidates = [elem for score, elem in ranked]
         
-        logger.info(f"Returning top {len(top_candidates)} candidates")
+        logger.info("Returning top %d candidates", len(top_candidates))
         return top_candidates
     
     def get_best_match(
         self, 
-        elements: List[DOMElement], 
+        elements: ElementsLike, 
         target_text: str,
         region_context: Optional[str] = None
     ) -> Optional[DOMElement]:
@@ -286,14 +696,14 @@ class ElementRanker:
         Get single best matching element.
         
         Args:
-            elements: List of DOMElement objects
+            elements: List of DOMElement objects (or an ElementBatch)
             target_text: Target text to match
             region_context: Optional region context
             
         Returns:
             Best matching element or None
         """
-        ranked = self.rank_elements(elements, target_text, region_context)
+        ranked = self.rank_top_n(elements, target_text, 1, region_context)
         
         if not ranked:
             logger.warning("No elements above threshold")
@@ -301,7 +711,7 @@ class ElementRanker:
         
         best_score, best_element = ranked[0]
         logger.info(
-            f"Best match: '{best_element.display_name}' with score {best_score:.3f}"
+            "Best match: '%s' with score %.3f", best_element.display_name, best_score
         )
         
         return best_element
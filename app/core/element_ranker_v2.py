@@ -2,9 +2,15 @@
 Element ranking V2: embeddings + substring + fuzzy + component + position.
 """
 from typing import List, Tuple, Any
+import numpy as np
 from app.core.semantic.embedding_scorer import EmbeddingScorer
 
 
+def _above_fold(comp: Any) -> bool:
+    bbox = getattr(comp, "bbox", None)
+    return bool(bbox and isinstance(bbox, dict) and bbox.get("y", 0) < 800)
+
+
 class ElementRankerV2:
     def __init__(self):
         self.scorer = EmbeddingScorer()
@@ -12,18 +18,18 @@ class ElementRankerV2:
     def rank(self, target: str, components: List[Any], top_n: int = 5) -> List[Tuple[float, Any]]:
         if not target or not components:
             return []
-        scored: List[Tuple[float, Any]] = []
-        for comp in components:
-            text = getattr(comp, "text", "") or ""
-            sem = self.scorer.score(target, text)
-            sub = 1.0 if (target or "").lower() in (text or "").lower() else 0.0
-            final = sem * 0.7 + sub * 0.3
-            # Position: prefer above fold
-            bbox = getattr(comp, "bbox", None)
-            if bbox and isinstance(bbox, dict):
-                y = bbox.get("y", 0)
-                if y < 800:
-                    final += 0.05
-            scored.append((final, comp))
-        scored.sort(key=lambda x: x[0], reverse=True)
-        return scored[:top_n]
+        texts = [getattr(comp, "text", "") or "" for comp in components]
+        # One batched embedding call for all components instead of one per component
+        sem = self.scorer.score_batch(target, texts)
+        target_lower = target.lower()
+        # Components built on BaseComponent carry their lower-cased text already
+        texts_lower = [
+            getattr(comp, "text_lower", None) or text.lower() for comp, text in zip(components, texts)
+        ]
+        sub = np.fromiter((target_lower in t for t in texts_lower), dtype=np.float64, count=len(texts))
+        final = sem * 0.7 + sub * 0.3
+        # Position: prefer above fold
+        final += np.fromiter((_above_fold(c) for c in components), dtype=bool, count=len(components)) * 0.05
+        # Stable descending order, matching sort(reverse=True) on ties
+        order = np.argsort(-final, kind="stable")[:top_n]
+        return [(float(final[i]), components[i]) for i in order]
@@ -7,6 +7,11 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Batched reads over a locator's matches (same elements and order as nth(i)): one CDP round-trip
+_TEXTS_JS = "(els) => els.map(e => e.textContent || '')"
+_VALUES_JS = "(els) => els.map(e => e.getAttribute('value') || '')"
+_UNCHECKED_JS = "(els) => els.map((e, i) => e.checked ? -1 : i).filter(i => i >= 0)"
+
 
 async def select_delivery(page: Page, option_text: str) -> bool:
     """
@@ -15,23 +20,17 @@ async def select_delivery(page: Page, option_text: str) -> bool:
     """
     try:
         labels = page.locator("label:visible")
-        n = await labels.count()
         option_lower = option_text.lower()
-        for i in range(n):
-            label = labels.nth(i)
-            text = (await label.text_content()) or ""
+        for i, text in enumerate(await labels.evaluate_all(_TEXTS_JS)):
             if option_lower in text.lower():
-                await label.click(timeout=3000)
+                await labels.nth(i).click(timeout=3000)
                 logger.info("[FLOW] Selected delivery: %s", text.strip()[:50])
                 return True
         # Fallback: radio by value or name
         radios = page.locator("input[type='radio']:visible")
-        nr = await radios.count()
-        for i in range(nr):
-            r = radios.nth(i)
-            val = (await r.get_attribute("value")) or ""
+        for i, val in enumerate(await radios.evaluate_all(_VALUES_JS)):
             if option_lower in val.lower():
-                await r.click(timeout=3000)
+                await radios.nth(i).click(timeout=3000)
                 return True
         return False
     except Exception as e:
@@ -43,13 +42,11 @@ async def click_all_checkboxes(page: Page) -> bool:
     """Check all visible checkboxes that are not already checked (e.g. T&C, consent)."""
     try:
         boxes = page.locator("input[type='checkbox']:visible")
-        n = await boxes.count()
         clicked = 0
-        for i in range(n):
-            box = boxes.nth(i)
-            if not await box.is_checked():
-                await box.check(timeout=2000)
-                clicked += 1
+        # Only the boxes unchecked at scan time; check() is a no-op if one got checked meanwhile
+        for i in await boxes.evaluate_all(_UNCHECKED_JS):
+            await boxes.nth(i).check(timeout=2000)
+            clicked += 1
         logger.info("[FLOW] Checked %d checkbox(es)", clicked)
         return True
     except Exception as e:
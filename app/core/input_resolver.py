@@ -8,6 +8,10 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+_INPUT_LABELS_JS = """
+(els) => els.map(e => [e.getAttribute('placeholder') || '', e.getAttribute('aria-label') || ''])
+"""
+
 
 async def resolve_input(page: Page, target: str) -> Optional[Any]:
     """
@@ -17,7 +21,13 @@ async def resolve_input(page: Page, target: str) -> Optional[Any]:
     Returns Playwright Locator or None.
     """
     inputs = page.locator("input:visible, textarea:visible")
-    count = await inputs.count()
+    # One round-trip for every input's placeholder/aria-label (same elements, same order as nth(i))
+    try:
+        labels = await inputs.evaluate_all(_INPUT_LABELS_JS)
+    except Exception as e:
+        logger.debug("[INPUT_RESOLVER] Batched label read failed, reading per input: %s", e)
+        labels = None
+    count = len(labels) if labels is not None else await inputs.count()
     if count == 0:
         return None
     if count == 1:
@@ -25,6 +35,14 @@ async def resolve_input(page: Page, target: str) -> Optional[Any]:
         return inputs.first
 
     target_lower = target.lower().strip()
+    if labels is not None:
+        for i, (placeholder, aria) in enumerate(labels):
+            combined = (placeholder + " " + aria).lower()
+            if target_lower in combined:
+                logger.info("[INPUT_RESOLVER] Matched by placeholder/aria: %s", combined[:50])
+                return inputs.nth(i)
+        return None
+
     for i in range(count):
         loc = inputs.nth(i)
         try:
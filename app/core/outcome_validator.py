@@ -3,53 +3,208 @@ Outcome validation - ensures state transitions are meaningful.
 Strong validation: DOM hash + URL; transition valid iff URL or DOM changed.
 """
 from playwright.async_api import Page
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 import logging
 import hashlib
+from dataclasses import dataclass, field
+import codecs
+import re
+import struct
+import weakref
 
 logger = logging.getLogger(__name__)
 
+try:
+    import xxhash as _xxhash
+except ImportError:
+    _xxhash = None
 
-async def dom_hash(page: Page) -> str:
-    """MD5 of full page content for strong state comparison."""
+_ERROR_INDICATORS = (
+    "error",
+    "404",
+    "not found",
+    "forbidden",
+    "unauthorized",
+)
+_ERROR_RE = re.compile("|".join(re.escape(i) for i in _ERROR_INDICATORS))
+
+# Characters encoded per hash update when streaming large pages
+_DIGEST_CHUNK = 1 << 16
+
+
+def content_digest_int(content: str) -> int:
+    """
+    64-bit non-cryptographic digest of page HTML as an int (equality checks only).
+    xxh3_64 (SIMD, several times faster than MD5 on megabyte-sized pages) when
+    xxhash is installed, else BLAKE2b-64 from hashlib.
+    """
+    if len(content) <= _DIGEST_CHUNK:
+        data = content.encode("utf-8", "surrogatepass")
+        if _xxhash is not None:
+            return _xxhash.xxh3_64_intdigest(data)
+        return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big")
+    # Large pages: encode and hash chunk by chunk so peak memory stays one chunk,
+    # not a second full UTF-8 copy of the HTML (same digest as the one-shot path)
+    h = _xxhash.xxh3_64() if _xxhash is not None else hashlib.blake2b(digest_size=8)
+    encode = codecs.getincrementalencoder("utf-8")("surrogatepass").encode
+    for i in range(0, len(content), _DIGEST_CHUNK):
+        h.update(encode(content[i:i + _DIGEST_CHUNK]))
+    return int.from_bytes(h.digest(), "big")
+
+
+def content_digest(content: str) -> str:
+    """Hex form of content_digest_int (16 chars)."""
+    return f"{content_digest_int(content):016x}"
+
+
+# Length + two 32-bit rolling hashes (FNV-1a and x31) over a string built in the page,
+# so only ~20 bytes cross CDP instead of the string itself.
+# Strings up to _FULL_HASH_CHARS are hashed in full. Beyond that (huge DOMs), the first and
+# last _EDGE_HASH_CHARS are still hashed in full and the middle is strided so the loop stays
+# O(_FULL_HASH_CHARS); the exact length is always part of the fingerprint.
+_FULL_HASH_CHARS = 2_000_000
+_EDGE_HASH_CHARS = 500_000
+_HASH_LOOP_JS = """
+    const n = s.length, edge = %d, cap = %d;
+    const stride = n > cap ? Math.ceil((n - 2 * edge) / (cap - 2 * edge)) : 1;
+    let h1 = 0x811c9dc5, h2 = 0;
+    for (let i = 0; i < n; i += (i < edge || i >= n - edge) ? 1 : stride) {
+        const c = s.charCodeAt(i);
+        h1 = Math.imul(h1 ^ c, 0x01000193);
+        h2 = (Math.imul(h2, 31) + c) | 0;
+    }
+""" % (_EDGE_HASH_CHARS, _FULL_HASH_CHARS)
+
+_FINGERPRINT_STRUCT = struct.Struct("<QII")
+
+_OUTER_HTML_JS = "document.documentElement ? document.documentElement.outerHTML : ''"
+
+
+def string_fingerprint_js(source_js: str) -> str:
+    """
+    page.evaluate() script that hashes the string expression source_js in the browser
+    and returns [length, h1, h2] (see pack_fingerprint).
+    """
+    return (
+        "() => {\n    const s = String(" + source_js + ");" + _HASH_LOOP_JS
+        + "    return [s.length, h1 >>> 0, h2 >>> 0];\n}"
+    )
+
+
+def pack_fingerprint(length: int, h1: int, h2: int) -> int:
+    """
+    64-bit int for a string_fingerprint_js() result: length and both 32-bit hashes
+    folded through BLAKE2b-64, so the length still separates otherwise equal hashes.
+    """
+    data = _FINGERPRINT_STRUCT.pack(length, h1, h2)
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big")
+
+
+# DOM fingerprint (outerHTML through the hash loop above), skipped when nothing changed
+# since the caller's last capture.
+# A MutationObserver (installed once per document) counts DOM mutations; the state key is
+# href + a per-document id (so a reload does not restart at a matching count) + that count.
+# Returns [key] when key == lastKey, else [key, document.title, length, h1, h2] (title fused in
+# to save the separate page.title() round trip).
+_KEYED_FINGERPRINT_JS = """
+(lastKey) => {
+    if (!window.__uiaMutationObserver) {
+        window.__uiaMutations = 0;
+        window.__uiaDocId = Math.random().toString(36).slice(2);
+        window.__uiaMutationObserver = new MutationObserver(() => { window.__uiaMutations++; });
+        window.__uiaMutationObserver.observe(document, {
+            subtree: true, childList: true, attributes: true, characterData: true
+        });
+    }
+    const key = location.href + '|' + window.__uiaDocId + '|' + window.__uiaMutations;
+    if (key === lastKey) return [key];
+    const s = """ + _OUTER_HTML_JS + ";" + _HASH_LOOP_JS + """
+    return [key, document.title, s.length, h1 >>> 0, h2 >>> 0];
+}
+"""
+
+
+async def keyed_dom_fingerprint(
+    page: Page, last_key: Optional[str]
+) -> Tuple[str, Optional[str], int]:
+    """
+    (state key, title, fingerprint) from one evaluate of _KEYED_FINGERPRINT_JS.
+    When the key still equals last_key (page not mutated since) nothing is hashed:
+    title is None and fingerprint 0. Raises if the script fails.
+    """
+    result = await page.evaluate(_KEYED_FINGERPRINT_JS, last_key)
+    if len(result) == 1:
+        return result[0], None, 0
+    key, title, length, h1, h2 = result
+    return key, title, pack_fingerprint(length, h1, h2)
+
+
+async def dom_hash(page: Page) -> int:
+    """Digest of full page content for strong state comparison (0 on failure)."""
     try:
         content = await page.content()
-        return hashlib.md5(content.encode()).hexdigest()
+        return content_digest_int(content)
     except Exception:
-        return ""
+        return 0
 
 
+@dataclass(slots=True, frozen=True, weakref_slot=True)
 class PageState:
-    """Represents the state of a page at a point in time (url + dom hash)."""
+    """
+    Represents the state of a page at a point in time (url + dom hash).
+    Equality is url + dom_hash only; title and visible_text_hash are informational.
+    Hashes are ints (0 = not captured), so comparisons are integer compares.
+    """
+    url: str
+    title: str = field(default="", compare=False)
+    dom_hash: Optional[int] = None
+    visible_text_hash: Optional[int] = field(default=None, compare=False)
+    _hash: Optional[int] = field(default=None, init=False, compare=False, repr=False)
     
-    def __init__(
-        self, 
-        url: str, 
-        title: str = "", 
-        dom_hash: Optional[str] = None,
-        visible_text_hash: Optional[str] = None
-    ):
-        self.url = url
-        self.title = title
-        self.dom_hash = dom_hash or ""
-        self.visible_text_hash = visible_text_hash or ""
+    def __post_init__(self):
+        # None -> 0 (frozen, so bypass __setattr__)
+        if self.dom_hash is None:
+            object.__setattr__(self, "dom_hash", 0)
+        if self.visible_text_hash is None:
+            object.__setattr__(self, "visible_text_hash", 0)
+    
+    def __hash__(self) -> int:
+        # Same fields as __eq__; computed once, states are looked up repeatedly in history sets
+        h = self._hash
+        if h is None:
+            h = hash((self.url, self.dom_hash))
+            object.__setattr__(self, "_hash", h)
+        return h
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary."""
+        """Convert to dictionary (hashes as 16-char hex strings, "" when not captured)."""
         return {
             "url": self.url,
             "title": self.title,
-            "dom_hash": self.dom_hash,
-            "visible_text_hash": self.visible_text_hash
+            "dom_hash": f"{self.dom_hash:016x}" if self.dom_hash else "",
+            "visible_text_hash": f"{self.visible_text_hash:016x}" if self.visible_text_hash else ""
         }
     
-    def __eq__(self, other) -> bool:
-        if not isinstance(other, PageState):
-            return False
-        return self.url == other.url and self.dom_hash == other.dom_hash
-    
     def __repr__(self) -> str:
-        return f"PageState(url={self.url}, hash={self.dom_hash[:8] if self.dom_hash else ''})"
+        return f"PageState(url={self.url}, hash={f'{self.dom_hash & 0xFFFFFFFF:08x}' if self.dom_hash else ''})"
+
+
+# Interned states: equal captures share one PageState object while anything still holds it
+_STATE_POOL: "weakref.WeakValueDictionary[tuple, PageState]" = weakref.WeakValueDictionary()
+
+
+def intern_state(state: PageState) -> PageState:
+    """
+    Canonical instance for state (same url, title, dom_hash, visible_text_hash).
+    Revisited states (retries, oscillating flows) then compare by identity first and
+    history lists hold one object per distinct state instead of one per capture.
+    """
+    key = (state.url, state.title, state.dom_hash, state.visible_text_hash)
+    existing = _STATE_POOL.get(key)
+    if existing is None:
+        _STATE_POOL[key] = state
+        return state
+    return existing
 
 
 class OutcomeValidator:
@@ -66,17 +221,56 @@ class OutcomeValidator:
             strict_mode: If True, requires significant state change
         """
         self.strict_mode = strict_mode
+        # (page, state key, state) of the last keyed capture; see _KEYED_FINGERPRINT_JS
+        self._last_capture: Optional[Tuple[Page, str, PageState]] = None
+    
+    async def _keyed_fingerprint(
+        self, page: Page
+    ) -> Tuple[Optional[PageState], str, Optional[str], int]:
+        """
+        (cached state or None, state key, title, fingerprint) for page from one evaluate.
+        The cached state is returned when the page has not mutated since the last
+        capture; key is "", fingerprint 0 and title None when the script fails.
+        """
+        last = self._last_capture
+        last_key = last[1] if last is not None and last[0] is page else None
+        try:
+            key, title, fingerprint = await keyed_dom_fingerprint(page, last_key)
+        except Exception:
+            return None, "", None, 0
+        if title is None:
+            return last[2], key, None, 0
+        return None, key, title, fingerprint
     
-    async def capture_state(self, page: Page) -> PageState:
+    async def capture_state(self, page: Page, level: str = "full") -> PageState:
         """
-        Capture current page state: URL + full DOM content hash (MD5).
+        Capture current page state: URL + full DOM content hash.
         Transition is valid iff URL or DOM hash changed.
+        The hash is the in-page fingerprint; page.content() is only pulled
+        and hashed here when the fingerprint script fails. Repeat captures of an
+        unmutated page (same document, same URL) reuse the previous state.
+        
+        Args:
+            page: Playwright page
+            level: "full" (URL + title + DOM hash) or "light" (URL + title only, one
+                call, no DOM work). Light states carry no dom_hash, so they are only
+                meaningful for URL checks such as validate_navigation.
         """
         try:
+            if level == "light":
+                state = intern_state(PageState(url=page.url, title=await page.title()))
+                logger.debug("Captured light state: %s", state)
+                return state
+            cached, key, title, hash_val = await self._keyed_fingerprint(page)
+            if cached is not None:
+                logger.debug("Captured state (unchanged): %s", cached)
+                return cached
             url = page.url
-            title = await page.title()
-            hash_val = await dom_hash(page)
-            state = PageState(url=url, title=title, dom_hash=hash_val)
+            if title is None:
+                title = await page.title()
+            hash_val = hash_val or await dom_hash(page)
+            state = intern_state(PageState(url=url, title=title, dom_hash=hash_val))
+            self._last_capture = (page, key, state) if key else None
             logger.debug("Captured state: %s", state)
             return state
         except Exception as e:
@@ -158,20 +352,14 @@ class OutcomeValidator:
         Returns:
             True if error state detected
         """
-        error_indicators = [
-            "error",
-            "404",
-            "not found",
-            "forbidden",
-            "unauthorized"
-        ]
-        
         title_lower = state.title.lower()
         url_lower = state.url.lower()
         
-        for indicator in error_indicators:
+        # One compiled scan per string; the (rare) hit is then attributed in list order
+        if not (_ERROR_RE.search(title_lower) or _ERROR_RE.search(url_lower)):
+            return False
+        for indicator in _ERROR_INDICATORS:
             if indicator in title_lower or indicator in url_lower:
                 logger.warning(f"Error state detected: {indicator}")
-                return True
-        
-        return False
+                break
+        return True
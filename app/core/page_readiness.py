@@ -11,6 +11,27 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+# Settle predicate for page.wait_for_function: a MutationObserver (installed on first
+# evaluation in each document) stamps the last structural/text mutation, and the browser
+# polls "quiet for ms" itself - no DOM serialization and no per-poll round trip.
+# Attribute mutations are not observed: animations and carousels rewrite style/class
+# attributes continuously and would keep the page from ever settling.
+_DOM_SETTLED_JS = """
+(ms) => {
+    if (!window.__uiaSettleObserver) {
+        window.__uiaLastMutation = performance.now();
+        window.__uiaSettleObserver = new MutationObserver(() => {
+            window.__uiaLastMutation = performance.now();
+        });
+        window.__uiaSettleObserver.observe(document, {
+            subtree: true, childList: true, characterData: true
+        });
+    }
+    return performance.now() - window.__uiaLastMutation >= ms;
+}
+"""
+
+
 def _now_ms() -> float:
     return time.monotonic() * 1000
 
@@ -34,26 +55,14 @@ async def wait_for_dom_settled(
     timeout_ms: int = 10000,
 ) -> bool:
     """
-    Wait until DOM hash is stable for stable_for_ms (no layout thrash).
+    Wait until the DOM has not mutated for stable_for_ms (no layout thrash).
     Returns True if settled, False on timeout.
     """
     try:
-        last_hash = None
-        stable_since = None
-        t0 = _now_ms()
-        while _now_ms() - t0 < timeout_ms:
-            content = await page.content()
-            h = str(hash(content[:5000]))
-            if h == last_hash:
-                if stable_since is None:
-                    stable_since = _now_ms()
-                elif _now_ms() - stable_since >= stable_for_ms:
-                    return True
-            else:
-                stable_since = None
-            last_hash = h
-            await page.wait_for_timeout(poll_interval_ms)
-        return False
+        await page.wait_for_function(
+            _DOM_SETTLED_JS, arg=stable_for_ms, polling=poll_interval_ms, timeout=timeout_ms
+        )
+        return True
     except Exception as e:
         logger.debug("wait_for_dom_settled: %s", e)
         return False
@@ -109,10 +118,23 @@ async def wait_for_page_ready(
     Use after navigation or heavy actions.
     """
     try:
+        t0 = _now_ms()
         await page.wait_for_load_state("domcontentloaded", timeout=timeout_ms)
-        if network_idle:
+        if network_idle and dom_settled:
+            # Both waits are browser-side, so run them together (max, not sum, of the two).
+            # The settle re-check returns on its first evaluation if the DOM stayed quiet
+            # through network idle, and otherwise waits out a fresh quiet window within
+            # whatever is left of timeout_ms (0 would mean no timeout to Playwright).
+            await asyncio.gather(
+                wait_for_network_idle(page, timeout_ms=min(5000, timeout_ms)),
+                wait_for_dom_settled(page, timeout_ms=min(3000, timeout_ms)),
+            )
+            remaining_ms = int(timeout_ms - (_now_ms() - t0))
+            if remaining_ms > 0:
+                await wait_for_dom_settled(page, timeout_ms=min(3000, remaining_ms))
+        elif network_idle:
             await wait_for_network_idle(page, timeout_ms=min(5000, timeout_ms))
-        if dom_settled:
+        elif dom_settled:
             await wait_for_dom_settled(page, timeout_ms=min(3000, timeout_ms))
     except Exception as e:
         logger.debug("wait_for_page_ready: %s", e)
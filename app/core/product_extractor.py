@@ -2,16 +2,26 @@
 Product card grouping and resolution.
 Product title text is nested inside card; we group by container and match target to card text.
 """
-from difflib import SequenceMatcher
 from playwright.async_api import Page
 from typing import List, Dict, Any, Optional
 import logging
+import numpy as np
 
-logger = logging.getLogger(__name__)
+from .element_ranker import best_similarity_index
 
+logger = logging.getLogger(__name__)
 
-def _similarity(a: str, b: str) -> float:
-    return SequenceMatcher(None, a.lower(), b.lower()).ratio()
+# [index, textContent] of the first _MAX_CARDS matches that are visible (non-empty box,
+# not visibility:hidden, as Locator.is_visible) and contain an anchor
+_MAX_CARDS = 80  # cap for performance
+_CARDS_JS = """
+(els) => els.slice(0, %d).map((e, i) => {
+    const r = e.getBoundingClientRect();
+    if (!r.width || !r.height || getComputedStyle(e).visibility === 'hidden') return null;
+    if (!e.querySelector('a')) return null;
+    return [i, e.textContent || ''];
+}).filter(row => row !== null)
+""" % _MAX_CARDS
 
 
 async def _scroll_before_product_match(page: Page) -> None:
@@ -34,18 +44,9 @@ async def extract_product_cards(page: Page) -> List[Dict[str, Any]]:
             "div[class*='product'], article[class*='product'], "
             "[data-testid*='product'], .product-card, .product-item"
         )
-        n = await cards.count()
-        for i in range(min(n, 80)):  # cap for performance
-            try:
-                card = cards.nth(i)
-                if not await card.is_visible():
-                    continue
-                text = (await card.text_content()) or ""
-                anchor = card.locator("a").first
-                if await anchor.count() > 0:
-                    results.append({"text": text.strip(), "locator": anchor})
-            except Exception:
-                continue
+        # Visibility, text and anchor presence for all cards in one round trip
+        for i, text in await cards.evaluate_all(_CARDS_JS):
+            results.append({"text": text.strip(), "locator": cards.nth(i).locator("a").first})
     except Exception as e:
         logger.debug("extract_product_cards: %s", e)
     return results
@@ -61,17 +62,25 @@ async def resolve_product(page: Page, target: str) -> Optional[Any]:
     if not cards:
         return None
 
-    scored: List[tuple] = []
     target_lower = target.lower()
-    for card in cards:
-        text = (card.get("text") or "").lower()
-        score = _similarity(text, target)
-        if target_lower in text:
-            score += 0.3
-        scored.append((score, card))
+    texts = [(card.get("text") or "").lower() for card in cards]
+
+    # A card containing the target scores at least 2*len(target)/(len(target)+len(text)) + 0.3
+    # (the whole target is a common subsequence). Once that exceeds 1.0, no card without the
+    # target can win, so only the containing cards are scored - none at all if there is one.
+    # (difflib's autojunk can split matches for targets of 200+ chars, so those skip this.)
+    lt = len(target_lower)
+    if 0 < lt < 200:
+        hits = [i for i, t in enumerate(texts) if target_lower in t]
+        if any(2 * lt / (lt + len(texts[i])) + 0.3 > 1.0 + 1e-9 for i in hits):
+            if len(hits) == 1:
+                return cards[hits[0]].get("locator")
+            cards = [cards[i] for i in hits]
+            texts = [texts[i] for i in hits]
 
-    scored.sort(key=lambda x: x[0], reverse=True)
-    if scored and scored[0][0] > 0.4:
-        best = scored[0][1]
-        return best.get("locator")
+    # Similarity + substring bonus; first of equal maxima, as the stable sort picked
+    bonus = np.fromiter((0.3 if target_lower in t else 0.0 for t in texts), dtype=np.float64, count=len(texts))
+    best, best_score = best_similarity_index(texts, target, bonus)
+    if best_score > 0.4:
+        return cards[best].get("locator")
     return None
@@ -3,7 +3,9 @@ Region-aware DOM model.
 Extract region before ranking so product links don't compete with footer/header.
 """
 from typing import List, Dict, Any
+import numpy as np
 from .dom_model import DOMElement
+from .element_batch import ElementBatch, ElementsLike
 
 
 class Region:
@@ -14,34 +16,52 @@ class Region:
         self.bbox = bbox  # {"x", "y", "width", "height"} or similar
 
 
-def detect_regions(elements: List[DOMElement]) -> Dict[str, List[DOMElement]]:
+def _class_mask(batch: ElementBatch, needle: str) -> np.ndarray:
+    """Mask of elements whose lower-cased class attribute contains needle (each distinct class tested once)."""
+    hits: Dict[str, bool] = {}
+
+    def contains(class_attr: str) -> bool:
+        hit = hits.get(class_attr)
+        if hit is None:
+            hit = hits[class_attr] = needle in class_attr.lower()
+        return hit
+
+    return np.fromiter(
+        (contains(str(e.attributes.get("class", ""))) for e in batch.source),
+        dtype=bool,
+        count=len(batch),
+    )
+
+
+def region_masks(elements: ElementsLike) -> Dict[str, np.ndarray]:
     """
-    Assign each element to a region: header, sidebar, product_grid, main.
-    Call this before ranking so we can restrict candidates by region.
+    Boolean mask per region (header, sidebar, product_grid, main), aligned with elements.
+    Position tests run on the batch's x / y columns (0 when there is no bounding box);
+    the class / container test is only evaluated for elements not already placed by position.
     """
-    regions: Dict[str, List[DOMElement]] = {
-        "header": [],
-        "sidebar": [],
-        "product_grid": [],
-        "main": [],
+    batch = ElementBatch.from_elements(elements)
+    header = batch.y < 200
+    sidebar = ~header & (batch.x < 300)
+    rest = ~(header | sidebar)
+    product = np.zeros(len(batch), dtype=bool)
+    if rest.any():
+        tail = batch[rest]
+        product[rest] = tail.container_mask("product") | _class_mask(tail, "product")
+    return {
+        "header": header,
+        "sidebar": sidebar,
+        "product_grid": product,
+        "main": rest & ~product,
     }
 
-    for e in elements:
-        y = e.bounding_box.y if e.bounding_box else 0
-        x = e.bounding_box.x if e.bounding_box else 0
-        class_attr = str(e.attributes.get("class", "")).lower()
-        container = (e.container or "").lower()
-
-        if y < 200:
-            regions["header"].append(e)
-        elif x < 300:
-            regions["sidebar"].append(e)
-        elif "product" in class_attr or "product" in container:
-            regions["product_grid"].append(e)
-        else:
-            regions["main"].append(e)
-
-    return regions
+
+def detect_regions(elements: ElementsLike) -> Dict[str, List[DOMElement]]:
+    """
+    Assign each element to a region: header, sidebar, product_grid, main.
+    Call this before ranking so we can restrict candidates by region.
+    """
+    batch = ElementBatch.from_elements(elements)
+    return {name: batch.to_list(mask) for name, mask in region_masks(batch).items()}
 
 
 def get_region_for_context(region_context: str) -> str:
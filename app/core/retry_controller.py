@@ -3,7 +3,7 @@ Retry controller - intelligent retry logic with backoff.
 """
 import asyncio
 import logging
-from typing import Callable, Any, Optional
+from typing import Callable, Any, Optional, Tuple
 from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
@@ -51,37 +51,52 @@ class RetryController:
         Raises:
             Exception if all retries fail
         """
-        last_exception = None
-        delay = self.config.initial_delay
+        max_attempts = self.config.max_attempts
+        delays = self._delay_schedule()
+        last_exception: Optional[Exception] = None
+        last_failed_result = None
         
-        for attempt in range(1, self.config.max_attempts + 1):
+        for attempt in range(1, max_attempts + 1):
             try:
-                logger.info(f"Attempt {attempt}/{self.config.max_attempts}")
+                logger.info("Attempt %d/%d", attempt, max_attempts)
                 result = await action_func(*args, **kwargs)
                 
                 # Check if result indicates success
                 if hasattr(result, 'success') and result.success:
-                    logger.info(f"✓ Action succeeded on attempt {attempt}")
+                    logger.info("✓ Action succeeded on attempt %d", attempt)
                     return result
                 elif not hasattr(result, 'success'):
                     # If no success attribute, assume success
                     return result
                 
-                # Result indicates failure
-                logger.warning(f"Attempt {attempt} failed, will retry...")
-                last_exception = Exception(f"Action failed: {result.error if hasattr(result, 'error') else 'Unknown'}")
+                # Result indicates failure; the exception is only built if this is the final outcome
+                logger.warning("Attempt %d failed, will retry...", attempt)
+                last_failed_result = result
+                last_exception = None
                 
             except Exception as e:
-                logger.warning(f"Attempt {attempt} raised exception: {e}")
+                logger.warning("Attempt %d raised exception: %s", attempt, e)
                 last_exception = e
+                last_failed_result = None
             
             # Wait before retry (except on last attempt)
-            if attempt < self.config.max_attempts:
-                await asyncio.sleep(min(delay, self.config.max_delay))
-                
-                if self.config.exponential_backoff:
-                    delay *= self.config.backoff_factor
+            if attempt < max_attempts:
+                await asyncio.sleep(delays[attempt - 1])
         
         # All attempts failed
-        logger.error(f"All {self.config.max_attempts} attempts failed")
+        logger.error("All %d attempts failed", max_attempts)
+        if last_failed_result is not None:
+            error = last_failed_result.error if hasattr(last_failed_result, 'error') else 'Unknown'
+            raise Exception(f"Action failed: {error}")
         raise last_exception or Exception("All retry attempts failed")
+    
+    def _delay_schedule(self) -> Tuple[float, ...]:
+        """Sleep before each retry (capped at max_delay), built once per execute_with_retry."""
+        config = self.config
+        delays = []
+        delay = config.initial_delay
+        for _ in range(max(config.max_attempts - 1, 0)):
+            delays.append(min(delay, config.max_delay))
+            if config.exponential_backoff:
+                delay *= config.backoff_factor
+        return tuple(delays)
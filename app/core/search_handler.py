@@ -2,13 +2,21 @@
 Composite search flow: click search icon (if any), resolve input, fill, Enter.
 """
 from playwright.async_api import Page
-from typing import Optional
+from typing import Dict, Optional
+from urllib.parse import urlparse
 import logging
 
 from .input_resolver import resolve_input
 
 logger = logging.getLogger(__name__)
 
+_SEARCH_ICON_SELECTOR = "button[aria-label*='search'], [aria-label*='Search']"
+
+# netloc -> whether the search icon was found there. Only a miss lets later searches skip the
+# probe; a hit is re-probed since the click itself needs the element. Home pages re-probe too,
+# so a site whose header only renders the icon there is not stuck on an early miss.
+_SEARCH_ICON_PRESENT: Dict[str, bool] = {}
+
 
 async def handle_search(page: Page, query: str) -> bool:
     """
@@ -17,13 +25,18 @@ async def handle_search(page: Page, query: str) -> bool:
     """
     try:
         # Click search icon if present
-        icon = page.locator("button[aria-label*='search'], [aria-label*='Search']").first
-        if await icon.count() > 0:
-            try:
-                await icon.click(timeout=3000)
-                await page.wait_for_timeout(1000)
-            except Exception:
-                pass
+        parsed = urlparse(page.url)
+        at_home = parsed.path in ("", "/")
+        if at_home or _SEARCH_ICON_PRESENT.get(parsed.netloc, True):
+            icon = page.locator(_SEARCH_ICON_SELECTOR).first
+            present = await icon.count() > 0
+            _SEARCH_ICON_PRESENT[parsed.netloc] = present
+            if present:
+                try:
+                    await icon.click(timeout=3000)
+                    await page.wait_for_timeout(1000)
+                except Exception:
+                    pass
 
         input_field = await resolve_input(page, "search")
         if not input_field:
@@ -1,19 +1,47 @@
 """
 Compute cosine similarity between user target and element text using embeddings.
 """
-from typing import Union, List
+from collections import OrderedDict
+from typing import Any, Union, List
 import logging
+import numpy as np
+from app.core.element_ranker import similarity_column, text_similarity
 from .embedding_loader import EmbeddingLoader
 
 logger = logging.getLogger(__name__)
 
+# text -> embedding row, shared by all scorers (EmbeddingLoader hands out one model and
+# components build a fresh EmbeddingScorer per score() call). LRU-bounded.
+_EMBED_CACHE: "OrderedDict[str, np.ndarray]" = OrderedDict()
+_EMBED_CACHE_SIZE = 4096
 
-def _cosine_similarity_sklearn(emb1, emb2) -> float:
-    from sklearn.metrics.pairwise import cosine_similarity
-    import numpy as np
-    a = np.asarray(emb1).reshape(1, -1)
-    b = np.asarray(emb2).reshape(1, -1)
-    return float(cosine_similarity(a, b)[0][0])
+
+def _embed(model: Any, texts: List[str]) -> np.ndarray:
+    """
+    Embedding rows for texts, encoding only the ones not seen before (in one encode() call).
+    Targets and candidate texts repeat across ranking calls, so most rows come from the cache.
+    """
+    missing = [t for t in dict.fromkeys(texts) if t not in _EMBED_CACHE]
+    if missing:
+        encoded = np.asarray(model.encode(missing, batch_size=64), dtype=np.float64)
+        for text, row in zip(missing, encoded):
+            row.flags.writeable = False
+            _EMBED_CACHE[text] = row
+    rows = []
+    for text in texts:
+        _EMBED_CACHE.move_to_end(text)
+        rows.append(_EMBED_CACHE[text])
+    while len(_EMBED_CACHE) > _EMBED_CACHE_SIZE:
+        _EMBED_CACHE.popitem(last=False)
+    return np.stack(rows)
+
+
+def _cosine_to_first(emb: np.ndarray) -> np.ndarray:
+    """Cosine similarity of rows 1.. against row 0 (zero vectors score 0.0, as in sklearn)."""
+    norms = np.linalg.norm(emb, axis=1)
+    norms[norms == 0] = 1.0
+    unit = emb / norms[:, None]
+    return unit[1:] @ unit[0]
 
 
 class EmbeddingScorer:
@@ -24,13 +52,32 @@ class EmbeddingScorer:
         if not user_target or not element_text:
             return 0.0
         if self.model is None:
-            from difflib import SequenceMatcher
-            return SequenceMatcher(None, user_target.lower(), (element_text or "").lower()).ratio()
+            return text_similarity(user_target, element_text)
         try:
-            emb1 = self.model.encode([user_target])
-            emb2 = self.model.encode([element_text])
-            return _cosine_similarity_sklearn(emb1, emb2)
+            return float(_cosine_to_first(_embed(self.model, [user_target, element_text]))[0])
         except Exception as e:
             logger.debug("Embedding score failed: %s", e)
-            from difflib import SequenceMatcher
-            return SequenceMatcher(None, user_target.lower(), (element_text or "").lower()).ratio()
+            return text_similarity(user_target, element_text)
+
+    def score_batch(self, user_target: str, element_texts: List[str]) -> np.ndarray:
+        """
+        score() for many texts against one target.
+        The target and all non-empty texts not yet cached are embedded in one encode()
+        call and compared with a single matrix-vector product, instead of two 1-item
+        forward passes per text. Empty texts score 0.0, as in score().
+        """
+        sims = np.zeros(len(element_texts), dtype=np.float64)
+        if not user_target:
+            return sims
+        idx = [i for i, t in enumerate(element_texts) if t]
+        if not idx:
+            return sims
+        texts = [element_texts[i] for i in idx]
+        if self.model is not None:
+            try:
+                sims[idx] = _cosine_to_first(_embed(self.model, [user_target] + texts))
+                return sims
+            except Exception as e:
+                logger.debug("Embedding batch score failed: %s", e)
+        sims[idx] = similarity_column(texts, user_target)
+        return sims
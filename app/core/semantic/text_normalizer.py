@@ -1,15 +1,15 @@
 """
 Normalize text for matching: trim, collapse whitespace, lower for comparison.
 """
-import re
 from typing import Optional
 
 
 def normalize(text: Optional[str], max_len: int = 600) -> str:
     if not text:
         return ""
-    t = str(text).strip()
-    t = re.sub(r"\s+", " ", t)
+    # Same result as re.sub(r"\s+", " ", t.strip()) (\s and str.split share the Unicode
+    # whitespace set), without the regex engine
+    t = " ".join(str(text).split())
     if max_len and len(t) > max_len:
         t = t[:max_len]
     return t
@@ -5,47 +5,80 @@ Includes overlay detection, behavioral simulation (hover, scroll), and smart wai
 from playwright.async_api import Page, Locator
 from typing import Optional
 import asyncio
+import contextlib
 import logging
+import math
+import os
 
 logger = logging.getLogger(__name__)
 
 
+def _env_pace() -> float:
+    """UI_AUTO_PACE as a non-negative float; unset, unparsable or infinite values mean 1.0."""
+    try:
+        pace = float(os.getenv("UI_AUTO_PACE", "1.0"))
+    except ValueError:
+        return 1.0
+    return max(0.0, pace) if math.isfinite(pace) else 1.0
+
+
+# Multiplier for deliberate human-like pauses (hover dwell, typing cadence); UI_AUTO_PACE=0 drops them
+HUMAN_PACE = _env_pace()
+
+
+_OVERLAY_SELECTORS = (
+    '.c-pop-msg__dimmed',
+    '.modal-backdrop',
+    '[class*="overlay"]',
+    '[class*="dimmed"]',
+    '.popup-overlay',
+    '[class*="modal-overlay"]',
+    '[style*="position: fixed"][style*="z-index"]',
+)
+_CLOSE_SELECTORS = (
+    '[aria-label*="close" i]',
+    '[class*="close"]',
+    'button:has-text("×")',
+    'button:has-text("Close")',
+)
+# Selector lists (OR), so each probe is a single query / round trip
+_OVERLAY_UNION = ", ".join(_OVERLAY_SELECTORS)
+_CLOSE_UNION = ", ".join(_CLOSE_SELECTORS)
+
+
+async def _settle_overlays(page: Page, timeout_ms: int = 500) -> None:
+    """
+    Wait (up to timeout_ms, the old fixed settle) for visible overlays to finish closing,
+    so the next strategy does not act on an overlay that is still animating out.
+    """
+    try:
+        await page.locator(f"{_OVERLAY_UNION} >> visible=true").first.wait_for(
+            state="hidden", timeout=timeout_ms
+        )
+    except Exception:
+        pass
+
+
 async def detect_and_dismiss_overlays(page: Page) -> bool:
     """
     Detect and dismiss common overlays (modals, popups, dimmed backgrounds).
     Returns True if overlays were found and dismissed.
     """
-    overlay_selectors = [
-        '.c-pop-msg__dimmed',
-        '.modal-backdrop',
-        '[class*="overlay"]',
-        '[class*="dimmed"]',
-        '.popup-overlay',
-        '[class*="modal-overlay"]',
-        '[style*="position: fixed"][style*="z-index"]'
-    ]
-    
-    found_overlays = False
-    
-    for selector in overlay_selectors:
-        try:
-            overlays = await page.locator(selector).all()
-            if overlays:
-                found_overlays = True
-                logger.info(f"✓ Detected {len(overlays)} overlay(s) matching '{selector}'")
-                break
-        except Exception:
-            continue
+    try:
+        overlay_count = await page.locator(_OVERLAY_UNION).count()
+    except Exception:
+        overlay_count = 0
     
-    if not found_overlays:
+    if not overlay_count:
         return False
     
+    logger.info(f"✓ Detected {overlay_count} overlay element(s)")
     logger.info("[SMART_INTERACTION] Attempting to dismiss overlays...")
     
     # Strategy 1: Press ESC key
     try:
         await page.keyboard.press('Escape')
-        await asyncio.sleep(0.5)
+        await _settle_overlays(page)
         logger.debug("✓ Pressed ESC key")
     except Exception as e:
         logger.debug(f"ESC key failed: {e}")
@@ -53,29 +86,20 @@ async def detect_and_dismiss_overlays(page: Page) -> bool:
     # Strategy 2: Click outside (top-left corner)
     try:
         await page.mouse.click(10, 10)
-        await asyncio.sleep(0.5)
+        await _settle_overlays(page)
         logger.debug("✓ Clicked outside overlay")
     except Exception as e:
         logger.debug(f"Click outside failed: {e}")
     
-    # Strategy 3: Look for close button
-    close_selectors = [
-        '[aria-label*="close" i]',
-        '[class*="close"]',
-        'button:has-text("×")',
-        'button:has-text("Close")'
-    ]
-    
-    for close_sel in close_selectors:
-        try:
-            close_btn = page.locator(close_sel).first
-            if await close_btn.is_visible():
-                await close_btn.click(timeout=2000)
-                await asyncio.sleep(0.3)
-                logger.debug(f"✓ Clicked close button: {close_sel}")
-                break
-        except Exception:
-            continue
+    # Strategy 3: Click the first visible close button
+    try:
+        close_btn = page.locator(f"{_CLOSE_UNION} >> visible=true").first
+        if await close_btn.is_visible():
+            await close_btn.click(timeout=2000)
+            await asyncio.sleep(0.3)
+            logger.debug("✓ Clicked close button")
+    except Exception:
+        pass
     
     return True
 
@@ -95,9 +119,8 @@ async def smart_click_with_overlay_handling(
             # Check for overlays before clicking
             await detect_and_dismiss_overlays(page)
             
-            # Ensure element is in viewport
+            # Ensure element is in viewport (click's actionability checks wait for it to be stable)
             await locator.scroll_into_view_if_needed()
-            await asyncio.sleep(0.2)
             
             # Try click
             await locator.click(timeout=5000)
@@ -111,9 +134,13 @@ async def smart_click_with_overlay_handling(
             if "intercepts pointer events" in error_msg or "not stable" in error_msg:
                 logger.warning(f"Attempt {attempt + 1}: Overlay blocking click - {e}")
                 
-                # Dismiss overlays and retry
+                # Dismiss overlays and retry; wait only until the target is visible again
+                # (at most wait_between_retries) instead of a fixed pause
                 await detect_and_dismiss_overlays(page)
-                await asyncio.sleep(wait_between_retries)
+                try:
+                    await locator.wait_for(state="visible", timeout=wait_between_retries * 1000)
+                except Exception:
+                    pass
                 
                 if attempt < max_retries - 1:
                     logger.info(f"Retrying click (attempt {attempt + 2}/{max_retries})...")
@@ -135,11 +162,10 @@ async def behavioral_hover(page: Page, locator: Locator) -> bool:
     try:
         # Scroll into view first
         await locator.scroll_into_view_if_needed()
-        await asyncio.sleep(0.1)
         
         # Hover
         await locator.hover(timeout=3000)
-        await asyncio.sleep(0.3)  # Wait for hover effects
+        await asyncio.sleep(0.3 * HUMAN_PACE)  # Wait for hover effects
         
         logger.debug("✓ Hover succeeded")
         return True
@@ -183,37 +209,34 @@ async def smart_wait_for_element(
     Wait for element with periodic overlay dismissal.
     Returns locator if found, None otherwise.
     """
-    start_time = asyncio.get_event_loop().time()
-    max_time = start_time + (timeout / 1000)
-    
     logger.info(f"[SMART_WAIT] Waiting for element: '{target}' (timeout={timeout}ms)")
     
     # Build flexible selector
     selector = f"text=/{target}/i"
+    locator = page.locator(selector).first
     
-    checks = 0
-    while asyncio.get_event_loop().time() < max_time:
-        checks += 1
-        
-        try:
-            # Check for overlays every few attempts
-            if checks % 3 == 0:
+    async def dismiss_overlays_periodically():
+        # Same cadence as the old poll loop (overlays checked every third interval)
+        while True:
+            await asyncio.sleep(3 * check_interval / 1000)
+            try:
                 await detect_and_dismiss_overlays(page)
-            
-            # Try to locate element
-            locator = page.locator(selector).first
-            if await locator.is_visible():
-                logger.info(f"✓ Element found after {checks} checks")
-                return locator
-            
-        except Exception:
-            pass
-        
-        # Wait before next check
-        await asyncio.sleep(check_interval / 1000)
+            except Exception:
+                pass
     
-    logger.warning(f"✗ Element not found after {checks} checks ({timeout}ms)")
-    return None
+    # Event-driven wait; overlay dismissal runs alongside and stops as soon as it returns
+    dismisser = asyncio.create_task(dismiss_overlays_periodically())
+    try:
+        await locator.wait_for(state="visible", timeout=timeout)
+        logger.info(f"✓ Element found: '{target}'")
+        return locator
+    except Exception:
+        logger.warning(f"✗ Element not found ({timeout}ms)")
+        return None
+    finally:
+        dismisser.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await dismisser
 
 
 async def force_click_with_js(page: Page, locator: Locator) -> bool:
@@ -222,7 +245,7 @@ async def force_click_with_js(page: Page, locator: Locator) -> bool:
     Returns True if click succeeded.
     """
     try:
-        await page.evaluate("el => el.click()", await locator.element_handle())
+        await locator.evaluate("el => el.click()")
         logger.debug("✓ JS click succeeded")
         return True
     except Exception as e:
@@ -238,19 +261,15 @@ async def safe_type_with_focus(page: Page, locator: Locator, text: str, clear_fi
     try:
         # Ensure element is in view and focused
         await locator.scroll_into_view_if_needed()
-        await asyncio.sleep(0.1)
-        
         await locator.focus()
-        await asyncio.sleep(0.1)
         
         # Clear if needed
         if clear_first:
             await locator.clear()
-            await asyncio.sleep(0.1)
         
         # Type with human-like delay
-        await locator.type(text, delay=50)
-        await asyncio.sleep(0.2)
+        await locator.type(text, delay=50 * HUMAN_PACE)
+        await asyncio.sleep(0.2 * HUMAN_PACE)
         
         logger.debug(f"✓ Typed text: '{text[:30]}...'")
         return True
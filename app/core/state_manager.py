@@ -2,12 +2,13 @@
 State management - tracks UI state transitions as a graph.
 This enables validation and prevents state drift.
 """
-from typing import List, Optional, Dict, Any
+from typing import Deque, List, Optional, Dict, Any
+from collections import defaultdict, deque
 from dataclasses import dataclass, field
 from datetime import datetime
 import logging
 
-from .outcome_validator import PageState
+from .outcome_validator import OutcomeValidator, PageState
 
 logger = logging.getLogger(__name__)
 
@@ -47,10 +48,13 @@ class StateGraph:
         Args:
             max_history: Maximum number of states to keep in history
         """
-        self.states: List[PageState] = []
+        # Bounded window: the deque drops the oldest state in O(1) once full
+        self.states: Deque[PageState] = deque(maxlen=max(max_history, 0))
         self.transitions: List[StateTransition] = []
         self.max_history = max_history
-        self.valid_transition_patterns: Dict[str, set] = {}
+        self.valid_transition_patterns: Dict[str, set] = defaultdict(set)
+        # Successful transitions per action, in order (index for get_successful_transitions_for_action)
+        self._successful_by_action: Dict[str, List[StateTransition]] = defaultdict(list)
     
     def add_state(self, state: PageState) -> None:
         """
@@ -61,10 +65,6 @@ class StateGraph:
         """
         self.states.append(state)
         
-        # Trim history if needed
-        if len(self.states) > self.max_history:
-            self.states = self.states[-self.max_history:]
-        
         logger.debug(f"Added state: {state}")
     
     def add_transition(
@@ -97,10 +97,8 @@ class StateGraph:
         
         # Record valid pattern
         if success:
-            pattern_key = f"{from_state.url}_{action}"
-            if pattern_key not in self.valid_transition_patterns:
-                self.valid_transition_patterns[pattern_key] = set()
-            self.valid_transition_patterns[pattern_key].add(to_state.url)
+            self.valid_transition_patterns[f"{from_state.url}_{action}"].add(to_state.url)
+            self._successful_by_action[action].append(transition)
         
         logger.info(
             f"Recorded transition: {from_state.url} --[{action}]--> {to_state.url}"
@@ -124,7 +122,7 @@ class StateGraph:
         Returns:
             List of recent states
         """
-        return self.states[-limit:]
+        return list(self.states)[-limit:]
     
     def get_transition_history(self, limit: int = 10) -> List[StateTransition]:
         """
@@ -168,10 +166,7 @@ class StateGraph:
         Returns:
             List of successful transitions
         """
-        return [
-            t for t in self.transitions 
-            if t.action == action and t.success
-        ]
+        return list(self._successful_by_action.get(action, ()))
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert state graph to dictionary."""
@@ -194,6 +189,8 @@ class StateManager:
         """Initialize state manager."""
         self.graph = StateGraph()
         self.current_page = None
+        # One validator per session so its capture cache (unchanged-page reuse) carries across steps
+        self._validator = OutcomeValidator()
     
     async def record_state(
         self, 
@@ -212,10 +209,7 @@ class StateManager:
         Returns:
             Captured PageState
         """
-        from .outcome_validator import OutcomeValidator
-        
-        validator = OutcomeValidator()
-        state = await validator.capture_state(page)
+        state = await self._validator.capture_state(page)
         
         # Check if this is a transition
         previous_state = self.graph.get_current_state()
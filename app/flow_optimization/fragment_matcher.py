@@ -1,9 +1,9 @@
 """
 Fragment matcher: match upcoming steps against stored fragments (by URL + step list).
 """
-import json
 from typing import List, Dict, Any, Optional
 
+from .fragment_model import extract_site, first_step_key, normalize_steps, steps_hash
 from .fragment_store import FragmentStore
 
 
@@ -22,30 +22,27 @@ class FragmentMatcher:
         """
         if not upcoming_steps:
             return None
-        rows = self.store.fetch_all()
-        for row in rows:
-            _, site, start_url, end_url, steps_json, success_count = row
-            steps = json.loads(steps_json)
-            if not steps:
-                continue
-            if not current_url.rstrip("/").startswith(start_url.rstrip("/")):
-                continue
-            prefix = upcoming_steps[: len(steps)]
-            if self._steps_match(prefix, steps):
+        # Same-site fragments starting with the same step, no longer than the upcoming steps,
+        # whose start is a prefix of current_url (most specific first). The upcoming steps are
+        # normalized once; each candidate is then one int compare against the stored
+        # steps_hash, with the list compare against the stored steps_norm only on a hash hit.
+        upcoming_norm = normalize_steps(upcoming_steps)
+        candidates = self.store.find_candidates(
+            extract_site(current_url),
+            current_url,
+            len(upcoming_steps),
+            first_step_key(upcoming_norm),
+        )
+        prefix_hashes: Dict[int, int] = {}
+        for end_url, stored_norm, stored_hash in candidates:
+            n = len(stored_norm)
+            h = prefix_hashes.get(n)
+            if h is None:
+                h = prefix_hashes[n] = steps_hash(upcoming_norm[:n])
+            if h == stored_hash and upcoming_norm[:n] == stored_norm:
                 return {
                     "end_url": end_url,
-                    "skip_count": len(steps),
+                    "skip_count": n,
                 }
         return None
 
-    def _steps_match(self, a: List[Dict], b: List[Dict]) -> bool:
-        if len(a) != len(b):
-            return False
-        for i, sa in enumerate(a):
-            sb = b[i]
-            if (sa.get("action") != sb.get("action")) or (
-                (sa.get("target") or "").strip().lower()
-                != (sb.get("target") or "").strip().lower()
-            ):
-                return False
-        return True
@@ -2,7 +2,40 @@
 Flow fragment model: reusable navigation chain (action intent only, no selectors).
 """
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import List, Dict, Any
+from urllib.parse import urlparse
+import hashlib
+import json
+
+
+@lru_cache(maxsize=256)
+def extract_site(url: str) -> str:
+    """Site key of a fragment URL (e.g. www.lg.com). Cached: matching calls it on every step."""
+    try:
+        parsed = urlparse(url)
+        return (parsed.netloc or "").lower().replace("www.", "")
+    except Exception:
+        return ""
+
+
+def normalize_steps(steps: List[Dict[str, Any]]) -> List[List[Any]]:
+    """[action, target stripped + lower-cased] per step (what fragment matching compares)."""
+    return [[s.get("action"), (s.get("target") or "").strip().lower()] for s in steps]
+
+
+def first_step_key(normalized: List[List[Any]]) -> str:
+    """Key of the first normalized step ("" for no steps); fragments are indexed by it."""
+    return json.dumps(normalized[0]) if normalized else ""
+
+
+def steps_hash(normalized: List[List[Any]]) -> int:
+    """
+    Stable signed 64-bit hash of normalize_steps() output (fits an SQLite INTEGER).
+    Not Python's hash(), which is salted per process and so cannot be stored.
+    """
+    data = json.dumps(normalized, separators=(",", ":")).encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big", signed=True)
 
 
 @dataclass
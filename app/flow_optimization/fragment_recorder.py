@@ -2,11 +2,10 @@
 Fragment Recorder - saves successful execution chains for reuse.
 """
 import logging
-from urllib.parse import urlparse
 from typing import List, Dict, Any, Optional
 
 from .fragment_store import FragmentStore
-from .fragment_model import FlowFragment
+from .fragment_model import FlowFragment, extract_site
 
 logger = logging.getLogger(__name__)
 
@@ -14,15 +13,6 @@ logger = logging.getLogger(__name__)
 DEFAULT_MIN_LENGTH = 2
 
 
-def _extract_site(url: str) -> str:
-    """Extract site from URL (e.g. www.lg.com)."""
-    try:
-        parsed = urlparse(url)
-        return (parsed.netloc or "").lower().replace("www.", "")
-    except Exception:
-        return ""
-
-
 def _step_to_dict(step) -> Dict[str, Any]:
     """Convert ExecutionStep to dict for fragment matching."""
     return {
@@ -84,30 +74,36 @@ def save_fragments(
                 url = getattr(r.after_state, "url", None)
             end_urls.append(url or flow_start_url)
 
-    site = _extract_site(flow_start_url)
+    site = extract_site(flow_start_url)
     if not site:
         return 0
 
-    saved = 0
+    fragments: List[FlowFragment] = []
+    # Fragments are the prefixes of one step list: convert each step once, then slice
+    all_step_dicts = [_step_to_dict(steps[i]) for i in range(N)] if N >= min_length else []
     for k in range(min_length, N + 1):
-        step_dicts = [_step_to_dict(steps[i]) for i in range(k)]
+        step_dicts = all_step_dicts[:k]
         end_url = end_urls[k - 1]
         if not end_url:
             continue
-        fragment = FlowFragment(
+        fragments.append(FlowFragment(
             site=site,
             start_url=flow_start_url.rstrip("/"),
             end_url=end_url.rstrip("/"),
             steps=step_dicts,
             success_count=1,
-        )
-        if fragment_store.save_or_update(fragment):
+        ))
+
+    # One transaction for the whole flow instead of a commit per fragment
+    saved = 0
+    for fragment, inserted in zip(fragments, fragment_store.save_or_update_many(fragments)):
+        if inserted:
             saved += 1
             logger.info(
                 "[FRAGMENT] Saved fragment: %d steps, %s -> %s",
-                k,
+                len(fragment.steps),
                 flow_start_url[:50],
-                end_url[:50],
+                fragment.end_url[:50],
             )
 
     return saved
@@ -5,9 +5,17 @@ import sqlite3
 import json
 import os
 from pathlib import Path
-from typing import List, Tuple, Any
+from typing import Dict, List, Optional, Tuple, Any
 
-from .fragment_model import FlowFragment
+from .fragment_model import FlowFragment, first_step_key, normalize_steps, steps_hash
+
+# Decoding stored steps is the hot JSON path (every candidate / cache fill); orjson parses
+# several times faster. Encoding stays on json.dumps: stored text is compared byte-for-byte
+# (unique index, first_step) and orjson's compact separators would not match existing rows.
+try:
+    from orjson import loads as _loads
+except ImportError:
+    _loads = json.loads
 
 
 def _default_db_path() -> str:
@@ -18,7 +26,18 @@ def _default_db_path() -> str:
 class FragmentStore:
     def __init__(self, db_path: str | None = None):
         self.db_path = db_path or _default_db_path()
-        self.conn = sqlite3.connect(self.db_path)
+        self.conn = sqlite3.connect(self.db_path, cached_statements=128)
+        # Fragments are advisory (a lost write only costs a missed shortcut), so trade
+        # durability of the last commits for throughput: WAL + NORMAL syncs once per checkpoint
+        # instead of twice per commit.
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        self.conn.execute("PRAGMA mmap_size=67108864")
+        # fetch_parsed() rows and the PRAGMA data_version they were read at. Own writes
+        # reset the cache; data_version catches commits from other connections to the file.
+        self._parsed: Optional[List[Tuple[str, str, str, List[Dict[str, Any]]]]] = None
+        self._parsed_version: Optional[int] = None
         self._create_table()
 
     def _create_table(self) -> None:
@@ -37,59 +56,133 @@ class FragmentStore:
         self.conn.execute(
             "CREATE INDEX IF NOT EXISTS idx_fragments_lookup ON fragments(site, start_url)"
         )
+        # Normalized steps, their hash, count and first-step key, computed once at insert
+        # (see fragment_model); databases created before these columns existed are
+        # migrated and backfilled here.
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(fragments)")}
+        if "steps_norm" not in columns:
+            self.conn.execute("ALTER TABLE fragments ADD COLUMN steps_norm TEXT")
+        if "steps_hash" not in columns:
+            self.conn.execute("ALTER TABLE fragments ADD COLUMN steps_hash INTEGER")
+        if "steps_len" not in columns:
+            self.conn.execute("ALTER TABLE fragments ADD COLUMN steps_len INTEGER")
+        if "first_step" not in columns:
+            self.conn.execute("ALTER TABLE fragments ADD COLUMN first_step TEXT")
+        stale = self.conn.execute(
+            """
+            SELECT id, steps FROM fragments
+            WHERE steps_norm IS NULL OR steps_hash IS NULL OR steps_len IS NULL
+               OR first_step IS NULL
+            """
+        ).fetchall()
+        for fragment_id, steps_json in stale:
+            norm = normalize_steps(_loads(steps_json))
+            self.conn.execute(
+                """
+                UPDATE fragments SET steps_norm = ?, steps_hash = ?, steps_len = ?, first_step = ?
+                WHERE id = ?
+                """,
+                (json.dumps(norm), steps_hash(norm), len(norm), first_step_key(norm), fragment_id),
+            )
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_fragments_steps_hash ON fragments(steps_hash)"
+        )
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_fragments_len ON fragments(site, steps_len)"
+        )
+        self.conn.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_fragments_first_step
+            ON fragments(site, first_step, steps_len)
+            """
+        )
+        # One row per (site, start_url, end_url, steps): the conflict target of save_or_update.
+        # Duplicates from before the index existed are merged into the oldest row first.
+        try:
+            self._create_unique_index()
+        except sqlite3.IntegrityError:
+            self.conn.execute(
+                """
+                UPDATE fragments SET success_count = (
+                    SELECT SUM(d.success_count) FROM fragments d
+                    WHERE d.site IS fragments.site AND d.start_url IS fragments.start_url
+                      AND d.end_url IS fragments.end_url AND d.steps IS fragments.steps
+                )
+                WHERE id IN (SELECT MIN(id) FROM fragments GROUP BY site, start_url, end_url, steps)
+                """
+            )
+            self.conn.execute(
+                """
+                DELETE FROM fragments WHERE id NOT IN (
+                    SELECT MIN(id) FROM fragments GROUP BY site, start_url, end_url, steps
+                )
+                """
+            )
+            self._create_unique_index()
         self.conn.commit()
 
-    def save(self, fragment: FlowFragment) -> None:
+    def _create_unique_index(self) -> None:
         self.conn.execute(
             """
-            INSERT INTO fragments (site, start_url, end_url, steps, success_count)
-            VALUES (?, ?, ?, ?, ?)
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_fragments_unique
+            ON fragments(site, start_url, end_url, steps)
+            """
+        )
+
+    def save(self, fragment: FlowFragment) -> None:
+        """Store fragment; an existing (site, start_url, end_url, steps) row is counted instead."""
+        self.save_or_update(fragment)
+
+    def save_or_update(self, fragment: FlowFragment, commit: bool = True) -> bool:
+        """
+        Save fragment or increment success_count if it exists.
+        Returns True if new insert, False if updated. The insert is skipped on a conflict
+        with idx_fragments_unique, so rowcount alone tells the two apart.
+        commit=False leaves the write in the open transaction (see save_or_update_many).
+        """
+        norm = normalize_steps(fragment.steps)
+        steps_json = json.dumps(fragment.steps)
+        cur = self.conn.execute(
+            """
+            INSERT INTO fragments
+                (site, start_url, end_url, steps, success_count,
+                 steps_norm, steps_hash, steps_len, first_step)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (site, start_url, end_url, steps) DO NOTHING
             """,
             (
                 fragment.site,
                 fragment.start_url,
                 fragment.end_url,
-                json.dumps(fragment.steps),
+                steps_json,
                 fragment.success_count,
+                json.dumps(norm),
+                steps_hash(norm),
+                len(norm),
+                first_step_key(norm),
             ),
         )
-        self.conn.commit()
-
-    def find_existing(
-        self, site: str, start_url: str, steps_json: str, end_url: str
-    ) -> int | None:
-        """Return fragment id if exists, else None."""
-        cur = self.conn.execute(
-            """
-            SELECT id FROM fragments
-            WHERE site = ? AND start_url = ? AND steps = ? AND end_url = ?
-            """,
-            (site, start_url, steps_json, end_url),
-        )
-        row = cur.fetchone()
-        return row[0] if row else None
-
-    def increment_success_count(self, fragment_id: int) -> None:
-        self.conn.execute(
-            "UPDATE fragments SET success_count = success_count + 1 WHERE id = ?",
-            (fragment_id,),
-        )
-        self.conn.commit()
+        inserted = cur.rowcount == 1
+        if not inserted:
+            self.conn.execute(
+                """
+                UPDATE fragments SET success_count = success_count + 1
+                WHERE site = ? AND start_url = ? AND end_url = ? AND steps = ?
+                """,
+                (fragment.site, fragment.start_url, fragment.end_url, steps_json),
+            )
+        if commit:
+            self.conn.commit()
+        self._parsed = None
+        return inserted
 
-    def save_or_update(self, fragment: FlowFragment) -> bool:
+    def save_or_update_many(self, fragments: List[FlowFragment]) -> List[bool]:
         """
-        Save fragment or increment success_count if exists.
-        Returns True if new insert, False if updated.
+        save_or_update() for each fragment inside one transaction (a single commit).
+        Returns the per-fragment inserted flags, in order. Rolls back on error.
         """
-        steps_json = json.dumps(fragment.steps)
-        existing = self.find_existing(
-            fragment.site, fragment.start_url, steps_json, fragment.end_url
-        )
-        if existing:
-            self.increment_success_count(existing)
-            return False
-        self.save(fragment)
-        return True
+        with self.conn:
+            return [self.save_or_update(fragment, commit=False) for fragment in fragments]
 
     def fetch_all(self) -> List[Tuple[Any, ...]]:
         cur = self.conn.execute(
@@ -97,5 +190,48 @@ class FragmentStore:
         )
         return cur.fetchall()
 
+    def find_candidates(
+        self, site: str, current_url: str, max_steps: int, first_step: str
+    ) -> List[Tuple[str, List[List[Any]], int]]:
+        """
+        (end_url, steps_norm, steps_hash) of fragments for site that start with first_step
+        (fragment_model.first_step_key), have 1..max_steps steps and whose start_url is a
+        prefix of current_url (both without trailing "/"), most specific start_url first.
+        steps_norm is the stored normalize_steps() output. The filters run in SQLite on
+        indexed columns, so only matching rows have their steps decoded.
+        """
+        cur = self.conn.execute(
+            """
+            SELECT end_url, steps_norm, steps_hash FROM fragments
+            WHERE site = :site
+              AND first_step = :first_step
+              AND steps_len BETWEEN 1 AND :max_steps
+              AND substr(:url, 1, length(rtrim(start_url, '/'))) = rtrim(start_url, '/')
+            ORDER BY length(rtrim(start_url, '/')) DESC, id
+            """,
+            {
+                "site": site,
+                "first_step": first_step,
+                "url": current_url.rstrip("/"),
+                "max_steps": max_steps,
+            },
+        )
+        return [(end_url, _loads(norm_json), h) for end_url, norm_json, h in cur]
+
+    def fetch_parsed(self) -> List[Tuple[str, str, str, List[Dict[str, Any]]]]:
+        """
+        (site, start_url, end_url, steps) per fragment in fetch_all() order, steps decoded.
+        Cached until the table changes, so repeat lookups skip the query and JSON decoding.
+        Treat the returned rows as read-only.
+        """
+        version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        if self._parsed is None or version != self._parsed_version:
+            self._parsed = [
+                (site, start_url, end_url, _loads(steps_json))
+                for _, site, start_url, end_url, steps_json, _ in self.fetch_all()
+            ]
+            self._parsed_version = version
+        return self._parsed
+
     def close(self) -> None:
         self.conn.close()
@@ -1,14 +1,19 @@
 """
 Optimizer engine: fragment reuse, URL shortcut, state shortcut; optional step dedup.
 """
+from collections import OrderedDict
 from typing import List, Dict, Any, Optional
 from playwright.async_api import Page
 
+from app.state_engine.page_classifier import PageType, get_page_type
 from .fragment_matcher import FragmentMatcher
 from .url_shortcut_registry import URLShortcutRegistry
 from .state_shortcut import StateShortcutRegistry
 from .step_dedup import deduplicate_steps
 
+# URLs whose page type is remembered (LRU)
+_PAGE_TYPE_CACHE_SIZE = 256
+
 
 class OptimizerEngine:
     def __init__(
@@ -22,6 +27,21 @@ class OptimizerEngine:
         self.shortcut_registry = shortcut_registry
         self.state_shortcut_registry = state_shortcut_registry or StateShortcutRegistry()
         self.use_step_dedup = use_step_dedup
+        # url -> PageType, so steps on the same URL skip the page.title() round trip
+        self._page_type_cache: "OrderedDict[str, PageType]" = OrderedDict()
+
+    async def _page_type(self, page: Page, url: str) -> PageType:
+        """get_page_type(page), cached per URL (UNKNOWN, which includes failures, is not cached)."""
+        page_type = self._page_type_cache.get(url)
+        if page_type is not None:
+            self._page_type_cache.move_to_end(url)
+            return page_type
+        page_type = await get_page_type(page)
+        if page_type is not PageType.UNKNOWN:
+            self._page_type_cache[url] = page_type
+            if len(self._page_type_cache) > _PAGE_TYPE_CACHE_SIZE:
+                self._page_type_cache.popitem(last=False)
+        return page_type
 
     async def optimize(
         self,
@@ -59,8 +79,7 @@ class OptimizerEngine:
         # 3) State shortcut: (page_type, target) -> URL (requires page classification)
         if steps:
             try:
-                from app.state_engine import get_page_type
-                page_type = await get_page_type(page)
+                page_type = await self._page_type(page, current_url)
                 state_url = self.state_shortcut_registry.resolve(
                     current_url, page_type.value, steps[0].get("target") or ""
                 )
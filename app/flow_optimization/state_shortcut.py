@@ -5,6 +5,13 @@ Enables "from listing page, target 'Split AC' -> known URL" without full fragmen
 from typing import Optional, Dict, Tuple, List
 import logging
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+from .url_shortcut_registry import _base_domain
+
 logger = logging.getLogger(__name__)
 
 # (page_type, target_lower_substring) -> path or full URL pattern
@@ -21,17 +28,46 @@ class StateShortcutRegistry:
 
     def __init__(self, shortcuts: Optional[List[Tuple[str, str, str]]] = None):
         self.shortcuts = shortcuts or STATE_SHORTCUTS
+        # page_type -> [(position, key, path)] in list order, so resolve only scans the
+        # buckets whose page type applies; position keeps the first listed shortcut winning
+        self._by_ptype: Dict[str, List[Tuple[int, str, str]]] = {}
+        for priority, (ptype, key, path) in enumerate(self.shortcuts):
+            self._by_ptype.setdefault(ptype, []).append((priority, key, path))
+        # Target keys matched in one pass (pyahocorasick, optional). A key can be listed for
+        # several page types, so each maps to its (position, page_type, path) entries.
+        self._automaton = None
+        if ahocorasick is not None and self.shortcuts:
+            entries: Dict[str, List[Tuple[int, str, str]]] = {}
+            for priority, (ptype, key, path) in enumerate(self.shortcuts):
+                entries.setdefault(key, []).append((priority, ptype, path))
+            self._automaton = ahocorasick.Automaton()
+            for key, key_entries in entries.items():
+                self._automaton.add_word(key, key_entries)
+            self._automaton.make_automaton()
 
     def resolve(self, base_url: str, page_type: str, target: str) -> Optional[str]:
         """If (page_type, target) matches a known shortcut, return full URL."""
         target_lower = (target or "").lower().strip()
         page_type_lower = (page_type or "").lower()
-        base = base_url.rstrip("/")
-        if "://" in base:
-            base_domain = base.split("/")[0] + "//" + base.split("/")[2]
-        else:
-            base_domain = base
-        for ptype, key, path in self.shortcuts:
-            if ptype in page_type_lower and key in target_lower:
-                return base_domain + path
-        return None
+        base_domain = _base_domain(base_url)
+        if self._automaton is not None:
+            best = min(
+                (
+                    entry
+                    for _, key_entries in self._automaton.iter(target_lower)
+                    for entry in key_entries
+                    if entry[1] in page_type_lower
+                ),
+                default=None,
+            )
+            return base_domain + best[2] if best is not None else None
+        best = None
+        for ptype, entries in self._by_ptype.items():
+            if ptype not in page_type_lower:
+                continue
+            for priority, key, path in entries:
+                if key in target_lower:
+                    if best is None or priority < best[0]:
+                        best = (priority, path)
+                    break
+        return base_domain + best[1] if best is not None else None
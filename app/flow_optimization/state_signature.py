@@ -1,19 +1,48 @@
 """
 State signature: identify pages reliably by URL + DOM hash prefix.
 """
-import hashlib
-from typing import Dict, Any
+from collections import OrderedDict
+from typing import Dict, Any, Tuple
 from playwright.async_api import Page
+from app.core.outcome_validator import content_digest, keyed_dom_fingerprint
+
+# id(page) -> (state key, signature hash) of the last signature, LRU. The state key (href +
+# per-document id + mutation count, see outcome_validator._KEYED_FINGERPRINT_JS) changes on
+# navigation and on any DOM mutation, so a hit is always current. A recycled id() cannot
+# match because the document id is random.
+_SIGNATURE_CACHE: "OrderedDict[int, Tuple[str, str]]" = OrderedDict()
+_SIGNATURE_CACHE_SIZE = 64
 
 
 async def generate_state_signature(page: Page) -> Dict[str, Any]:
     """
     Generate a stable signature for the current page (URL + partial DOM hash).
     Used to validate fragment reuse and detect already-reached state.
+    The DOM is hashed in the browser, so the HTML is not transferred, and not at all
+    when the page has not mutated since its last signature. When the fingerprint script
+    fails, page.content() is digested instead; that hash is a different function, so
+    hashes are only comparable between signatures taken on the same path.
     """
     try:
-        content = await page.content()
-        dom_hash = hashlib.md5(content.encode()).hexdigest()
+        page_id = id(page)
+        cached = _SIGNATURE_CACHE.get(page_id)
+        try:
+            key, title, fingerprint = await keyed_dom_fingerprint(
+                page, cached[0] if cached is not None else None
+            )
+        except Exception:
+            key = None
+        if key is None:
+            dom_hash = content_digest(await page.content())
+        elif title is None:
+            dom_hash = cached[1]
+            _SIGNATURE_CACHE.move_to_end(page_id)
+        else:
+            dom_hash = f"{fingerprint:016x}"
+            _SIGNATURE_CACHE[page_id] = (key, dom_hash)
+            _SIGNATURE_CACHE.move_to_end(page_id)
+            if len(_SIGNATURE_CACHE) > _SIGNATURE_CACHE_SIZE:
+                _SIGNATURE_CACHE.popitem(last=False)
         return {
             "url": page.url,
             "hash": dom_hash[:12],
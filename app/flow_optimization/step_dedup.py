@@ -2,8 +2,11 @@
 Step deduplication: merge consecutive WAITs, drop no-op steps, collapse identical clicks.
 Learned flows can be simplified before storage and execution.
 """
+import re
 from typing import List, Dict, Any
 
+_WAIT_RE = re.compile(r"(\d+(?:\.\d+)?)\s*(?:s|sec|second)?", re.I)
+
 
 def deduplicate_steps(steps: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
@@ -13,36 +16,38 @@ def deduplicate_steps(steps: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     if not steps:
         return []
     out: List[Dict[str, Any]] = []
-    i = 0
-    while i < len(steps):
-        s = steps[i]
+    # One forward pass: WAIT seconds accumulate until the next non-WAIT step flushes them;
+    # last_click_target is out[-1]'s stripped target when out[-1] is a CLICK, else None
+    pending_wait_sec = 0.0
+    last_click_target = None
+    for s in steps:
         action = (s.get("action") or "").upper()
         if action == "WAIT":
-            total_sec = _parse_wait_sec(s)
-            j = i + 1
-            while j < len(steps) and (steps[j].get("action") or "").upper() == "WAIT":
-                total_sec += _parse_wait_sec(steps[j])
-                j += 1
-            if total_sec > 0:
-                out.append({"action": "WAIT", "target": str(total_sec), "value": str(total_sec)})
-            i = j
+            pending_wait_sec += _parse_wait_sec(s)
             continue
-        # Consecutive identical CLICK(target): keep first
-        if action == "CLICK" and out and (out[-1].get("action") or "").upper() == "CLICK":
-            if (out[-1].get("target") or "").strip() == (s.get("target") or "").strip():
-                i += 1
+        if pending_wait_sec > 0:
+            out.append({"action": "WAIT", "target": str(pending_wait_sec), "value": str(pending_wait_sec)})
+            last_click_target = None
+        pending_wait_sec = 0.0
+        if action == "CLICK":
+            target = (s.get("target") or "").strip()
+            # Consecutive identical CLICK(target): keep first
+            if target == last_click_target:
                 continue
+            last_click_target = target
+        else:
+            last_click_target = None
         out.append(s)
-        i += 1
+    if pending_wait_sec > 0:
+        out.append({"action": "WAIT", "target": str(pending_wait_sec), "value": str(pending_wait_sec)})
     return out
 
 
 def _parse_wait_sec(step: Dict[str, Any]) -> float:
-    import re
     for raw in (step.get("value"), step.get("target")):
         if not raw:
             continue
-        m = re.search(r"(\d+(?:\.\d+)?)\s*(?:s|sec|second)?", str(raw), re.I)
+        m = _WAIT_RE.search(str(raw))
         if m:
             return float(m.group(1))
     return 0.0
@@ -1,8 +1,23 @@
 """
 URL shortcut registry: predictable paths for known targets (e.g. LG Split AC page).
 """
+from functools import lru_cache
 from typing import Optional, Dict
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+@lru_cache(maxsize=256)
+def _base_domain(base_url: str) -> str:
+    """scheme://host of base_url (base_url without trailing "/" when it has no scheme)."""
+    base = base_url.rstrip("/")
+    if "://" in base:
+        return base.split("/")[0] + "//" + base.split("/")[2]
+    return base
+
 
 class URLShortcutRegistry:
     def __init__(self) -> None:
@@ -21,15 +36,22 @@ class URLShortcutRegistry:
             "buy electronics & it": "/in/consumer-electronics/",
             "buy electronics and it": "/in/consumer-electronics/",
         }
+        # All keys matched in one pass over the target (pyahocorasick, optional); values
+        # carry the key's position in patterns so the first listed key still wins
+        self._automaton = None
+        if ahocorasick is not None and self.patterns:
+            self._automaton = ahocorasick.Automaton()
+            for priority, (key, path) in enumerate(self.patterns.items()):
+                self._automaton.add_word(key, (priority, path))
+            self._automaton.make_automaton()
 
     def resolve(self, base_url: str, target: str) -> Optional[str]:
         """If target matches a known pattern, return full URL for that path."""
-        base = base_url.rstrip("/")
-        if "://" in base:
-            base_domain = base.split("/")[0] + "//" + base.split("/")[2]
-        else:
-            base_domain = base
+        base_domain = _base_domain(base_url)
         target_lower = (target or "").lower().strip()
+        if self._automaton is not None:
+            best = min((value for _, value in self._automaton.iter(target_lower)), default=None)
+            return base_domain + best[1] if best is not None else None
         for key, path in self.patterns.items():
             if key in target_lower:
                 return base_domain + path
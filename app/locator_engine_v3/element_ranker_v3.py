@@ -12,7 +12,9 @@ class ElementRankerV3:
     """Select best locator from fused results."""
 
     def __init__(self, threshold: float = 0.38):
-        self.threshold = threshold
+        self.threshold = float(threshold)
+        # Few-candidate fallback floor
+        self._th_low = 0.25
 
     def pick_best(
         self,
@@ -22,12 +24,13 @@ class ElementRankerV3:
         """Return best locator if score >= threshold, else None."""
         if not fused_results:
             return None
-        th = threshold if threshold is not None else self.threshold
         best = fused_results[0]
-        if best.get("score", 0) >= th:
+        score = best.get("score", 0.0)
+        th = self.threshold if threshold is None else threshold
+        if score >= th:
             return best.get("locator")
         # Fallback: if we have few candidates, accept best above 0.25
-        if len(fused_results) <= 5 and best.get("score", 0) >= 0.25:
-            logger.info("[RANKER_V3] Accepting best below threshold (few candidates): %.2f", best.get("score"))
+        if score >= self._th_low and len(fused_results) <= 5:
+            logger.info("[RANKER_V3] Accepting best below threshold (few candidates): %.2f", score)
             return best.get("locator")
         return None
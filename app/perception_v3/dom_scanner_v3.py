@@ -7,16 +7,25 @@ OPTIMIZED: Incremental extraction with DOM hash caching.
 from playwright.async_api import Page
 from typing import List, Dict, Any, Optional, Tuple
 import logging
-import hashlib
+from app.core.outcome_validator import pack_fingerprint, string_fingerprint_js
 
 logger = logging.getLogger(__name__)
 
+# Signature of the first 100 visible-ish links/buttons (tag + text head + top), hashed in the
+# page so only the fingerprint crosses CDP
+_DOM_SIGNATURE_FINGERPRINT_JS = string_fingerprint_js("""(() => {
+    const clickables = document.querySelectorAll('a:not([style*="display:none"]):not([style*="display: none"]), button:not([style*="display:none"]):not([style*="display: none"])');
+    return Array.from(clickables).slice(0, 100).map(el => 
+        el.tagName + (el.textContent || '').slice(0, 20) + el.getBoundingClientRect().top
+    ).join('|');
+})()""")
+
 
 class DOMScannerV3:
     """Extracts visible clickable elements via scroll-through (top, mid, bottom) with caching."""
     
     def __init__(self):
-        self._last_dom_hash: Optional[str] = None
+        self._last_dom_hash: Optional[int] = None
         self._cached_clickables: List[Dict[str, Any]] = []
         self._cached_inputs: List[Dict[str, Any]] = []
         self._cache_hits = 0
@@ -30,18 +39,12 @@ class DOMScannerV3:
 
     INPUT_SELECTOR = "input, textarea, select"
 
-    async def _compute_dom_hash(self, page: Page) -> str:
-        """Fast hash of visible DOM structure."""
+    async def _compute_dom_hash(self, page: Page) -> int:
+        """Fast hash of visible DOM structure (0 on failure)."""
         try:
-            dom_signature = await page.evaluate("""() => {
-                const clickables = document.querySelectorAll('a:not([style*="display:none"]):not([style*="display: none"]), button:not([style*="display:none"]):not([style*="display: none"])');
-                return Array.from(clickables).slice(0, 100).map(el => 
-                    el.tagName + (el.textContent || '').slice(0, 20) + el.getBoundingClientRect().top
-                ).join('|');
-            }""")
-            return hashlib.md5(dom_signature.encode('utf-8')).hexdigest()
+            return pack_fingerprint(*await page.evaluate(_DOM_SIGNATURE_FINGERPRINT_JS))
         except Exception:
-            return ""
+            return 0
 
     async def scan_clickables(self, page: Page, force_refresh: bool = False) -> List[Dict[str, Any]]:
         """
@@ -60,10 +60,11 @@ class FusionEngineV3:
             sem_score = float(encoder.cosine(target_emb, emb))
 
             # Substring (critical for LG products)
-            substring_score = 1.0 if target_lower in dom_text.lower() else 0.0
-            if substring_score == 0 and target_lower and dom_text.lower():
+            dom_lower = dom_text.lower()
+            substring_score = 1.0 if target_lower in dom_lower else 0.0
+            if substring_score == 0 and target_lower and dom_lower:
                 words = target_lower.split()[:5]
-                matches = sum(1 for w in words if len(w) > 2 and w in dom_text.lower())
+                matches = sum(1 for w in words if len(w) > 2 and w in dom_lower)
                 if matches >= 2:
                     substring_score = 0.7
 
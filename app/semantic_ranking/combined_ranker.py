@@ -4,10 +4,10 @@ Combined score: semantic * 0.5 + visual * 0.2 + structural * 0.2 + component * 0
 Long-text: fuzzy + subsequence detection.
 """
 from typing import List, Tuple, Optional, Any
-from difflib import SequenceMatcher
 import re
 import logging
 
+from app.core.element_ranker import text_similarity
 from .embedding_scorer import semantic_similarity
 
 logger = logging.getLogger(__name__)
@@ -43,7 +43,7 @@ def _fuzzy_subsequence(needle: str, haystack: str) -> float:
 
 
 def _text_sim(a: str, b: str) -> float:
-    return SequenceMatcher(None, (a or "").lower(), (b or "").lower()).ratio()
+    return text_similarity(a or "", b or "")
 
 
 def _visual_score(bbox: Optional[dict], viewport_height: float = 900) -> float: